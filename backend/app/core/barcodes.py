@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import threading
+import time
+import orjson
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.product import Product
+
+
+class BarcodeEntry:
+    """Önceden serileştirilmiş ürün: yanıt gövdesi ve ETag hazır"""
+    __slots__ = ("product", "body", "etag")
+
+    def __init__(self, product: dict):
+        self.product = product
+        self.body = orjson.dumps(product)
+        self.etag = f'W/"{hashlib.sha1(self.body).hexdigest()}"'
+
+
+class BarcodeCache:
+    """
+    Barkod → ürün eşlemesi, süreç içi.
+
+    Tüm barkodlu ürünler tek sorguda yüklenir ve sözlük bütün olarak
+    değiştirilir; okuma kilitsizdir. Ürün eklenince / silinince invalidate()
+    çağrılır, diğer süreçlerdeki değişiklikler en geç ttl saniyede görünür.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._entries: dict[str, BarcodeEntry] | None = None
+        self._expires_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def fresh(self) -> bool:
+        return self._entries is not None and self._expires_at > time.monotonic()
+
+    def refresh(self):
+        """Önbellek eskiyse veritabanından yeniden yükler (eşzamanlı çağrılar tek yükleme yapar)"""
+        with self._lock:
+            if self.fresh:
+                return
+            generation = self._generation
+            db = SessionLocal()
+            try:
+                rows = db.query(
+                    Product.id, Product.name, Product.barcode, Product.unit_price, Product.vat_rate
+                ).filter(Product.barcode.is_not(None)).all()
+            finally:
+                db.close()
+            self._entries = {
+                row.barcode: BarcodeEntry(dict(
+                    id=row.id,
+                    name=row.name,
+                    barcode=row.barcode,
+                    unit_price=row.unit_price,
+                    vat_rate=float(row.vat_rate.value) if row.vat_rate is not None else None,
+                ))
+                for row in rows
+            }
+            # Yükleme sırasında invalidate() geldiyse sonuç eski sayılır
+            if generation == self._generation:
+                self._expires_at = time.monotonic() + self.ttl
+
+    def get(self, barcode: str) -> BarcodeEntry | None:
+        """Yalnız fresh iken çağrılmalı (önce refresh)"""
+        return self._entries.get(barcode)
+
+    def invalidate(self):
+        self._generation += 1
+        self._expires_at = 0.0
+
+
+barcode_cache = BarcodeCache(ttl=settings.barcode_cache_ttl)
+
+
+def combined_etag(entries) -> str:
+    """Toplu yanıtın ETag'i: içindeki ürün ETag'lerinden türetilir"""
+    digest = hashlib.sha1()
+    for entry in entries:
+        digest.update(entry.etag.encode() if entry is not None else b"-")
+    return f'W/"{digest.hexdigest()}"'
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from sqlalchemy import select, update, insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.catalog_version import CatalogVersion
+from app.models.product import Product
+
+CATALOG_ROW_ID = 1
+
+
+class CatalogProduct:
+    """Fiyatlama için ürünün değişmez özeti (KDV oranı hazır float)"""
+    __slots__ = ("id", "name", "unit_price", "vat_rate")
+
+    def __init__(self, id: int, name: str, unit_price: float, vat_rate: float):
+        self.id = id
+        self.name = name
+        self.unit_price = unit_price
+        self.vat_rate = vat_rate
+
+
+class CatalogSnapshot:
+    """Belirli bir katalog sürümündeki tüm ürünler (id → CatalogProduct)"""
+    __slots__ = ("version", "products")
+
+    def __init__(self, version: int, products: dict[int, CatalogProduct]):
+        self.version = version
+        self.products = products
+
+
+# ------------------ Sürüm ------------------
+
+def read_catalog_version(db: Session) -> int:
+    version = db.execute(
+        select(CatalogVersion.version).where(CatalogVersion.id == CATALOG_ROW_ID)
+    ).scalar()
+    return version or 0
+
+
+def bump_catalog_version(db: Session):
+    """Ürün değişikliğiyle aynı işlemde sürümü artırır; commit çağırana aittir"""
+    result = db.execute(
+        update(CatalogVersion)
+        .where(CatalogVersion.id == CATALOG_ROW_ID)
+        .values(version=CatalogVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        db.execute(insert(CatalogVersion).values(id=CATALOG_ROW_ID, version=1))
+
+
+# ------------------ Anlık Görüntü ------------------
+
+def load_snapshot(db: Session) -> CatalogSnapshot:
+    # Sürüm ürünlerden önce okunur: arada değişiklik olursa sonraki kontrol yeniden yükler
+    version = read_catalog_version(db)
+    rows = db.execute(select(Product.id, Product.name, Product.unit_price, Product.vat_rate))
+    products = {
+        row.id: CatalogProduct(
+            row.id,
+            row.name,
+            float(row.unit_price or 0),
+            float(row.vat_rate.value) if row.vat_rate is not None else 0.0,
+        )
+        for row in rows
+    }
+    return CatalogSnapshot(version, products)
+
+
+class Catalog:
+    """
+    Fatura fiyatlamasının okuduğu süreç içi katalog.
+
+    Anlık görüntü bütün olarak değiştirilir; okuyan taraf kilit almaz ve
+    bir fatura boyunca aynı sürümü görür. Bu süreçteki ürün değişiklikleri
+    invalidate() ile hemen, diğer süreçlerinkiler en geç check_interval
+    saniyede (tek satırlık sürüm sorgusuyla) fark edilir.
+    """
+
+    def __init__(self, check_interval: float):
+        self.check_interval = check_interval
+        self._snapshot: CatalogSnapshot | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Başlangıçta kataloğu belleğe alır"""
+        db = SessionLocal()
+        try:
+            self._swap(load_snapshot(db))
+        finally:
+            db.close()
+
+    def current(self, db: Session) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+                return snapshot
+            if snapshot is None or read_catalog_version(db) != snapshot.version:
+                snapshot = load_snapshot(db)
+            self._swap(snapshot)
+            return snapshot
+
+    def invalidate(self):
+        """Sonraki current() çağrısı sürümü yeniden kontrol eder"""
+        self._checked_at = 0.0
+
+    def _swap(self, snapshot: CatalogSnapshot):
+        self._snapshot = snapshot
+        self._checked_at = time.monotonic()
+
+
+catalog = Catalog(check_interval=settings.catalog_check_interval)
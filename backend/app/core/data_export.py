@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import csv
+import io
+import orjson
+from sqlalchemy import select
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.customer import Customer
+from app.models.invoice import Invoice, InvoiceItem
+from app.models.product import Product
+
+
+# ------------------ Satır Sorgusu ------------------
+
+# Her satır bir fatura kalemi; kalemsiz fatura tek satır (kalem alanları boş)
+EXPORT_COLUMNS = (
+    Invoice.id.label("invoice_id"),
+    Invoice.fatura_no,
+    Invoice.date,
+    Invoice.customer_id,
+    Customer.name.label("customer_name"),
+    Invoice.subtotal,
+    Invoice.discount_total,
+    Invoice.vat_total,
+    Invoice.grand_total,
+    InvoiceItem.id.label("item_id"),
+    InvoiceItem.product_id,
+    Product.barcode,
+    Product.name.label("product_name"),
+    InvoiceItem.quantity,
+    InvoiceItem.unit_price,
+    InvoiceItem.discount_rate,
+    InvoiceItem.vat_rate,
+    InvoiceItem.line_total,
+)
+
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+
+def export_query(filters):
+    return (
+        select(*EXPORT_COLUMNS)
+        .select_from(Invoice)
+        .outerjoin(Customer, Customer.id == Invoice.customer_id)
+        .outerjoin(InvoiceItem, InvoiceItem.invoice_id == Invoice.id)
+        .outerjoin(Product, Product.id == InvoiceItem.product_id)
+        .where(*filters)
+        .order_by(Invoice.id, InvoiceItem.id)
+    )
+
+
+def iter_export_batches(filters):
+    """
+    Satırları sunucu tarafı imleçle export_fetch_size'lık partiler halinde okur.
+    Oturum akış bitince (veya istemci koparsa) kapanır.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            export_query(filters).execution_options(yield_per=max(1, settings.export_fetch_size))
+        )
+        for rows in result.partitions():
+            yield rows
+    finally:
+        db.close()
+
+
+# ------------------ Biçimler ------------------
+
+def stream_invoices_csv(filters):
+    """Başlık satırı + her parti için tek parça CSV"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for rows in iter_export_batches(filters):
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def stream_invoices_ndjson(filters):
+    """Satır başına bir JSON nesnesi (orjson, tarih ISO 8601)"""
+    for rows in iter_export_batches(filters):
+        yield b"".join(
+            orjson.dumps(dict(zip(EXPORT_FIELDS, row)), option=orjson.OPT_APPEND_NEWLINE)
+            for row in rows
+        )
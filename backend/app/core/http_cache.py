@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+from fastapi.responses import Response
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match başlığı verilen ETag ile eşleşiyor mu (zayıf karşılaştırma)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """İstemcideki kopya güncel: gövdesiz 304"""
+    return Response(status_code=304, headers={"ETag": etag})
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+from sqlalchemy import update, func, cast, Integer
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.invoice import Invoice
+from app.models.invoice_sequence import InvoiceSequence
+
+
+def format_fatura_no(year: int, number: int) -> str:
+    return f"FAT-{year}-{number:05d}"
+
+
+def allocate_invoice_numbers(db: Session, year: int, count: int = 1) -> range:
+    """
+    Yıl için count adet ardışık sıra numarası ayırır.
+
+    Tek bir UPDATE ... RETURNING ile çalışır ve çağıranın işlemi içinde kalır:
+    fatura kaydı geri alınırsa numara da geri alınır, eşzamanlı işçiler ise
+    satır kilidinde sıraya girer (IntegrityError / tekrar deneme yok).
+    """
+    stmt = (
+        update(InvoiceSequence)
+        .where(InvoiceSequence.year == year)
+        .values(last_value=InvoiceSequence.last_value + count)
+        .returning(InvoiceSequence.last_value)
+    )
+    last = db.execute(stmt).scalar()
+    if last is None:
+        _create_sequence(db, year)
+        last = db.execute(stmt).scalar()
+    return range(last - count + 1, last + 1)
+
+
+def _create_sequence(db: Session, year: int):
+    """Yılın sayacını, varsa o yıla ait en büyük mevcut numaradan başlatır"""
+    prefix = format_fatura_no(year, 0)[:-5]  # "FAT-2025-"
+    current_max = (
+        db.query(func.max(cast(func.substr(Invoice.fatura_no, len(prefix) + 1), Integer)))
+        .filter(Invoice.fatura_no.like(f"{prefix}%"))
+        .scalar()
+    )
+    try:
+        # Başka bir işçi aynı anda oluşturduysa onunki kullanılır
+        with db.begin_nested():
+            db.add(InvoiceSequence(year=year, last_value=current_max or 0))
+    except IntegrityError:
+        pass
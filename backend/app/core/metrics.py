@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+İstek süreleri, SQL sayaçları ve adlandırılmış aralıklar (span).
+
+Kapalıyken (MFP_METRICS_ENABLED=false) ara katman ve SQLAlchemy dinleyicileri
+hiç kurulmaz; span() yalnız bir ContextVar okuması yapar.
+Veriler /metrics üzerinden Prometheus metin biçiminde ve her yanıtta
+Server-Timing başlığıyla sunulur.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+# ------------------ İstek Bağlamı ------------------
+
+class RequestStats:
+    """Tek isteğin ölçümleri; sync endpoint'lerin thread'lerine ContextVar ile taşınır"""
+    __slots__ = ("sql_count", "sql_seconds", "orm_instances", "spans")
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.orm_instances = 0     # yalnız ORM nesneleri; sütun seçen sorgular sayılmaz
+        self.spans: dict[str, float] = {}
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("mfp_request_stats", default=None)
+
+
+# ------------------ Kayıt Defteri ------------------
+
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: dict[tuple, Histogram] = {}      # (method, route, status)
+        self.sql: dict[tuple, list] = {}                # (method, route) → [adet, süre, ORM nesnesi]
+        self.spans: dict[str, Histogram] = {}
+
+    def record_request(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        with self._lock:
+            self.requests.setdefault((method, route, status), Histogram()).observe(seconds)
+            totals = self.sql.setdefault((method, route), [0, 0.0, 0])
+            totals[0] += stats.sql_count
+            totals[1] += stats.sql_seconds
+            totals[2] += stats.orm_instances
+
+    def record_span(self, name: str, seconds: float):
+        with self._lock:
+            self.spans.setdefault(name, Histogram()).observe(seconds)
+
+    def render(self, gauges: dict[str, float]) -> str:
+        """Prometheus metin biçimi (text/plain; version=0.0.4)"""
+        lines = []
+        with self._lock:
+            lines.append("# TYPE mfp_http_request_duration_seconds histogram")
+            for (method, route, status), hist in sorted(self.requests.items()):
+                labels = f'method="{method}",route="{route}",status="{status}"'
+                _histogram_lines(lines, "mfp_http_request_duration_seconds", labels, hist)
+
+            for index, (name, help_text) in enumerate((
+                ("mfp_sql_statements_total", "SQL statements executed"),
+                ("mfp_sql_duration_seconds_total", "Time spent in SQL statements"),
+                ("mfp_orm_instances_loaded_total", "ORM instances loaded (column-only selects not counted)"),
+            )):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for (method, route), totals in sorted(self.sql.items()):
+                    lines.append(f'{name}{{method="{method}",route="{route}"}} {totals[index]}')
+
+            lines.append("# TYPE mfp_span_duration_seconds histogram")
+            for name, hist in sorted(self.spans.items()):
+                _histogram_lines(lines, "mfp_span_duration_seconds", f'span="{name}"', hist)
+
+        for name, value in sorted(gauges.items()):
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(lines, name, labels, hist: Histogram):
+    cumulative = 0
+    for bound, count in zip(LATENCY_BUCKETS, hist.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {hist.count}')
+    lines.append(f"{name}_sum{{{labels}}} {hist.total}")
+    lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+
+registry = MetricsRegistry()
+
+
+# ------------------ Span ------------------
+
+@contextmanager
+def span(name: str):
+    """Kod bloğunun süresini isteğin Server-Timing'ine ve span histogramına yazar"""
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_spans({name: time.perf_counter() - started})
+
+
+def record_spans(timings: dict[str, float]):
+    """Başka süreçte (PDF işçisi) ölçülen süreleri aktif isteğe ekler"""
+    stats = _current.get()
+    if stats is None:
+        return
+    for name, seconds in timings.items():
+        stats.spans[name] = stats.spans.get(name, 0.0) + seconds
+        registry.record_span(name, seconds)
+
+
+# ------------------ SQLAlchemy Dinleyicileri ------------------
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current.get() is not None:
+        context.mfp_query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "mfp_query_start", None)
+    if stats is None or started is None:
+        return
+    stats.sql_count += 1
+    stats.sql_seconds += time.perf_counter() - started
+
+
+def _on_load(target, context):
+    stats = _current.get()
+    if stats is not None:
+        stats.orm_instances += 1
+
+
+# ------------------ ASGI Ara Katmanı ------------------
+
+class MetricsMiddleware:
+    """
+    Saf ASGI ara katmanı (BaseHTTPMiddleware gibi gövdeyi sarmaz, akışları bozmaz).
+    Server-Timing başlığı yanıt başlarken o ana kadarki ölçümlerle yazılır.
+    """
+
+    def __init__(self, app, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", server_timing_header(stats, started).encode("latin-1")))
+                    message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            registry.record_request(
+                scope["method"], route_path, status_code, time.perf_counter() - started, stats
+            )
+
+
+def server_timing_header(stats: RequestStats, started: float) -> str:
+    parts = [f"app;dur={(time.perf_counter() - started) * 1000:.1f}"]
+    if stats.sql_count:
+        parts.append(f'db;dur={stats.sql_seconds * 1000:.1f};desc="{stats.sql_count} queries"')
+    for name, seconds in stats.spans.items():
+        parts.append(f"{name};dur={seconds * 1000:.1f}")
+    return ", ".join(parts)
+
+
+# ------------------ Kurulum ------------------
+
+def install_metrics(app, base):
+    """Ara katmanı ve dinleyicileri ekler; metrics_enabled kapalıysa hiçbir şey yapmaz"""
+    if not settings.metrics_enabled:
+        return
+    app.add_middleware(MetricsMiddleware, server_timing=settings.server_timing)
+    # Engine sınıfına: sync motor ve async motorun altındaki sync motor birlikte
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(base, "load", _on_load, propagate=True)
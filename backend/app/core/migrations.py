@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Sürümlü şema geçişleri (migration).
+
+Betikler app/migrations altında vNNNN_ad.py olarak durur ve sırayla bir kez
+çalışır; uygulananlar schema_version tablosuna yazılır. Her betik
+upgrade(ctx) fonksiyonu tanımlar ve işlemlerini kendisi yönetir: büyük
+tablolarda indeks çevrim içi (PostgreSQL'de CONCURRENTLY) kurulur, veri
+doldurma parça parça ayrı işlemlerde yapılır. Yardımcılar yarıda kalan
+bir geçişin yeniden çalıştırılabilmesi için "yoksa ekle" mantığındadır.
+"""
+import importlib
+import logging
+import pkgutil
+import re
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_PACKAGE = "app.migrations"
+MODULE_NAME = re.compile(r"^v(\d{4})_(\w+)$")
+ADVISORY_LOCK_KEY = 7_401_024       # PostgreSQL: aynı anda tek geçiş çalıştırıcısı
+
+# Uygulama modellerinden ayrı: create_all ile oluşturulmaz, yalnız çalıştırıcıya aittir
+_metadata = MetaData()
+schema_version = Table(
+    "schema_version", _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class Migration:
+    __slots__ = ("version", "name", "module")
+
+    def __init__(self, version: int, name: str, module):
+        self.version = version
+        self.name = name
+        self.module = module
+
+
+def discover_migrations() -> list[Migration]:
+    """app/migrations içindeki betikleri sürüm sırasıyla döner"""
+    package = importlib.import_module(MIGRATIONS_PACKAGE)
+    migrations = []
+    for info in pkgutil.iter_modules(package.__path__):
+        match = MODULE_NAME.match(info.name)
+        if match is None:
+            continue
+        module = importlib.import_module(f"{MIGRATIONS_PACKAGE}.{info.name}")
+        migrations.append(Migration(int(match.group(1)), match.group(2), module))
+    migrations.sort(key=lambda migration: migration.version)
+    versions = [migration.version for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Aynı numaralı geçiş betikleri var: {versions}")
+    return migrations
+
+
+# ------------------ Geçiş Bağlamı ------------------
+
+class MigrationContext:
+    """Betiklerin kullandığı yardımcılar; her biri kendi işlemini açar"""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.dialect = engine.dialect.name
+
+    @contextmanager
+    def transaction(self):
+        with self.engine.begin() as conn:
+            if self.dialect == "postgresql":
+                # Uzun süren bir işlemin arkasında kuyruğa girip tabloyu
+                # herkese kilitlemek yerine hata ver (geçiş tekrar çalıştırılabilir)
+                conn.exec_driver_sql("SET LOCAL lock_timeout = '5s'")
+            yield conn
+
+    def has_column(self, table: str, column: str) -> bool:
+        with self.engine.connect() as conn:
+            return any(c["name"] == column for c in inspect(conn).get_columns(table))
+
+    def add_column(self, table: str, column: Column):
+        """Boş bırakılabilir sütunu yoksa ekler (tablo yeniden yazılmaz)"""
+        if self.has_column(table, column.name):
+            return
+        if not column.nullable:
+            raise RuntimeError(f"Zorunlu sütun önce boş bırakılabilir eklenip doldurulmalı: {table}.{column.name}")
+        with self.transaction() as conn:
+            preparer = conn.dialect.identifier_preparer
+            column_type = column.type.compile(dialect=conn.dialect)
+            conn.exec_driver_sql(
+                f"ALTER TABLE {preparer.quote(table)} ADD COLUMN {preparer.quote(column.name)} {column_type}"
+            )
+        logger.info("Sütun eklendi: %s.%s", table, column.name)
+
+    def create_index(self, name: str, table: str, columns: tuple[str, ...], unique: bool = False):
+        """
+        İndeksi yoksa oluşturur. PostgreSQL'de CONCURRENTLY ile (yazmalar
+        durmaz, işlem dışında çalışır); SQLite'ta WAL sayesinde okumalar
+        sürer, yazmalar indeks süresince bekler.
+        """
+        quote = self.engine.dialect.identifier_preparer.quote
+        ddl = (
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX {{concurrently}}IF NOT EXISTS {quote(name)} "
+            f"ON {quote(table)} ({', '.join(quote(column) for column in columns)})"
+        )
+
+        if self.dialect != "postgresql":
+            with self.transaction() as conn:
+                conn.exec_driver_sql(ddl.format(concurrently=""))
+        else:
+            with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                # Yarıda kalmış CONCURRENTLY geçersiz (INVALID) indeks bırakır: silip yeniden kur
+                invalid = conn.execute(
+                    text(
+                        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                        "WHERE c.relname = :name AND NOT i.indisvalid"
+                    ),
+                    {"name": name},
+                ).first()
+                if invalid:
+                    conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {quote(name)}")
+                conn.exec_driver_sql(ddl.format(concurrently="CONCURRENTLY "))
+        logger.info("İndeks hazır: %s", name)
+
+
+# ------------------ Çalıştırıcı ------------------
+
+def applied_versions(conn: Connection) -> set[int]:
+    if not inspect(conn).has_table(schema_version.name):
+        return set()
+    return set(conn.execute(select(schema_version.c.version)).scalars())
+
+
+@contextmanager
+def _runner_lock(engine: Engine):
+    """PostgreSQL'de iki çalıştırıcının aynı anda geçiş yapmasını engeller"""
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+
+
+def pending_migrations(engine: Engine, target: int | None = None) -> list[Migration]:
+    with engine.connect() as conn:
+        applied = applied_versions(conn)
+    return [
+        migration for migration in discover_migrations()
+        if migration.version not in applied and (target is None or migration.version <= target)
+    ]
+
+
+def upgrade(engine: Engine, target: int | None = None) -> list[Migration]:
+    """Bekleyen geçişleri sırayla uygular; uygulananları döner"""
+    with _runner_lock(engine):
+        _metadata.create_all(bind=engine)
+        ctx = MigrationContext(engine)
+        done = []
+        # Kilit alındıktan sonra yeniden oku: başka çalıştırıcı uygulamış olabilir
+        for migration in pending_migrations(engine, target):
+            logger.info("Geçiş uygulanıyor: v%04d %s", migration.version, migration.name)
+            migration.module.upgrade(ctx)
+            with engine.begin() as conn:
+                conn.execute(schema_version.insert().values(
+                    version=migration.version, name=migration.name, applied_at=datetime.now(),
+                ))
+            done.append(migration)
+    return done
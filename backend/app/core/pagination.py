@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from collections import OrderedDict
+from fastapi import HTTPException, Query, Request, Response
+from sqlalchemy import select, func
+from app.core.config import settings
+
+
+class PageParams:
+    """
+    Anahtar kümesi (keyset) sayfalama parametreleri.
+
+    after: önceki sayfanın son id'si (X-Next-Cursor), limit: sayfa boyu,
+    fields: virgülle ayrılmış alan listesi (id her zaman döner).
+    """
+
+    def __init__(
+        self,
+        after: int | None = Query(None, ge=0, description="Önceki sayfanın son id'si"),
+        limit: int = Query(settings.page_size_default, ge=1, le=settings.page_size_max),
+        fields: str | None = Query(None, description="Örn. name,barcode"),
+    ):
+        self.after = after
+        self.limit = limit
+        self.fields = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+
+
+def page_columns(model, params: PageParams, allowed: tuple[str, ...]):
+    """İstenen alanların sütunlarını döner; bilinmeyen alan 400"""
+    names = params.fields or list(allowed)
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Bilinmeyen alan: {', '.join(unknown)}")
+    if "id" not in names:
+        names = ["id"] + names
+    return [getattr(model, name) for name in names]
+
+
+def page_query(model, params: PageParams, allowed: tuple[str, ...], *filters):
+    """id > after sırasıyla limit+1 satır (sonraki sayfa var mı anlamak için)"""
+    stmt = select(*page_columns(model, params, allowed)).where(*filters)
+    if params.after is not None:
+        stmt = stmt.where(model.id > params.after)
+    return stmt.order_by(model.id).limit(params.limit + 1)
+
+
+def count_query(model, *filters):
+    return select(func.count()).select_from(model).where(*filters)
+
+
+def finish_page(rows, params: PageParams, request: Request, response: Response, total: int):
+    """Satırları sözlüğe çevirir, sayfalama bilgisini başlıklara yazar"""
+    items = [dict(row._mapping) for row in rows[:params.limit]]
+    response.headers["X-Total-Count"] = str(total)
+    if len(rows) > params.limit:
+        cursor = str(items[-1]["id"])
+        response.headers["X-Next-Cursor"] = cursor
+        next_url = request.url.include_query_params(after=cursor, limit=params.limit)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return items
+
+
+def count_key(model, filters, key_parts):
+    """
+    Toplam sayısının önbellek anahtarı. Filtre varsa çağıran, filtre
+    değerlerini key_parts ile vermelidir; verilmezse sayı önbelleğe alınmaz.
+    """
+    if filters and key_parts is None:
+        return None
+    return (model.__tablename__, *(key_parts or ()))
+
+
+def paginate(db, model, params: PageParams, request: Request, response: Response,
+             allowed: tuple[str, ...], filters=(), key_parts=None):
+    """Senkron oturum için tek adımda sayfa"""
+    rows = db.execute(page_query(model, params, allowed, *filters)).all()
+    key = count_key(model, filters, key_parts)
+
+    def compute():
+        return db.execute(count_query(model, *filters)).scalar_one()
+
+    total = compute() if key is None else count_cache.get_or_compute(key, compute)
+    return finish_page(rows, params, request, response, total)
+
+
+async def paginate_async(db, model, params: PageParams, request: Request, response: Response,
+                         allowed: tuple[str, ...], filters=(), key_parts=None):
+    """paginate'in AsyncSession karşılığı"""
+    rows = (await db.execute(page_query(model, params, allowed, *filters))).all()
+    key = count_key(model, filters, key_parts)
+    total = count_cache.get(key) if key is not None else None
+    if total is None:
+        total = (await db.execute(count_query(model, *filters))).scalar_one()
+        if key is not None:
+            count_cache.put(key, total)
+    return finish_page(rows, params, request, response, total)
+
+
+# ------------------ Toplam Sayısı Önbelleği ------------------
+
+class CountCache:
+    """
+    COUNT(*) sonuçlarını kısa süre saklar; her sayfada tabloyu yeniden saymaz.
+    Ekleme / silme yapan endpoint'ler invalidate(tablo) çağırır.
+
+    Anahtarlar istemcinin filtre değerlerini içerir: kayıt sayısı sınırlıdır
+    (en uzun süre kullanılmayan düşer), süresi dolanlar eklemede temizlenir.
+    """
+
+    def __init__(self, ttl: int, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._values: OrderedDict[tuple, tuple[float, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> int | None:
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._values[key]
+                return None
+            self._values.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: tuple, value: int):
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._values[key] = (now + self.ttl, value)
+            self._values.move_to_end(key)
+            if len(self._values) > self.max_entries:
+                for expired in [k for k, (expires_at, _) in self._values.items() if expires_at <= now]:
+                    del self._values[expired]
+            while len(self._values) > self.max_entries:
+                self._values.popitem(last=False)
+
+    def get_or_compute(self, key: tuple, compute) -> int:
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def invalidate(self, table: str):
+        with self._lock:
+            for key in [k for k in self._values if k[0] == table]:
+                del self._values[key]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+count_cache = CountCache(ttl=settings.count_cache_ttl, max_entries=settings.count_cache_size)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, status
+from app.core.config import settings
+
+
+class PasswordHasher:
+    """
+    bcrypt için ayrılmış, sınırlı thread havuzu.
+
+    bcrypt GIL'i bırakır ama yüzlerce milisaniye CPU yakar; AnyIO threadpool'unda
+    çalışırsa giriş patlamalarında diğer tüm sync endpoint'leri aç bırakır.
+    Burada kendi işçi sayısı ve bekleme sınırı vardır; sınır aşılırsa 503 döner.
+    Havuz uygulama açılışında start() ile kurulur, kapanışta shutdown() ile
+    bırakılır; açılış atlanmışsa ilk işte kurulur.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+
+    # ------------------ Yaşam Döngüsü ------------------
+
+    def start(self):
+        with self._lock:
+            self._start_locked()
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _start_locked(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    # ------------------ İş Gönderme ------------------
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Sunucu yoğun, lütfen biraz sonra tekrar deneyin.",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+            executor = self._executor or self._start_locked()
+        try:
+            return await asyncio.wrap_future(executor.submit(self._timed, fn, *args))
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _timed(self, fn, *args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._completed += 1
+                self._total_seconds += elapsed
+                self._max_seconds = max(self._max_seconds, elapsed)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "pending": self._pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "total_seconds": self._total_seconds,
+                "max_seconds": self._max_seconds,
+            }
+
+
+
+password_hasher = PasswordHasher(workers=settings.hash_workers, max_pending=settings.hash_max_pending)
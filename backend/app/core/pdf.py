@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import os
+import time
+from functools import lru_cache
+from app.core.config import BASE_DIR
+from app.core.pdf_cache import pdf_cache
+from app.core.pricing import price_stored_items, vat_breakdown
+from app.core.metrics import record_spans
+
+TEMPLATE_DIR = os.path.join(BASE_DIR, "templates")
+LOGO_PATH = os.path.join(BASE_DIR, "static", "ertan.png")
+
+
+# --------------------- Yardımcı Fonksiyonlar ---------------------
+
+def tl_format(x):
+    try:
+        return f"₺{float(x):,.2f}".replace(",", ".").replace(".", ",", 1)
+    except Exception:
+        return "₺0,00"
+
+
+def get_logo_path():
+    """Logo yolunu sistemden otomatik olarak çeker"""
+    if os.path.exists(LOGO_PATH):
+        return f"file:///{os.path.abspath(LOGO_PATH).replace(os.sep, '/')}"
+    return None
+
+
+# --------------------- Şablon ve Stil (tek seferlik) ---------------------
+# WeasyPrint (cffi, fontTools, Pillow, pydyf) içe aktarması saniyeler sürer:
+# web süreci açılırken değil, ilk PDF'te ya da PDF işçisi başlarken yüklenir.
+
+def _read_template_file(name: str) -> str:
+    with open(os.path.join(TEMPLATE_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+# Şablon veya stil değişirse eski önbellek kayıtları geçersiz olsun
+TEMPLATE_VERSION = hashlib.sha256(
+    (_read_template_file("invoice.html") + _read_template_file("invoice.css")).encode("utf-8")
+).hexdigest()[:16]
+
+
+@lru_cache(maxsize=None)
+def invoice_template():
+    from jinja2 import Environment, FileSystemLoader
+    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+    env.globals["tl_format"] = tl_format
+    return env.get_template("invoice.html")
+
+
+@lru_cache(maxsize=None)
+def invoice_styles():
+    """(stil, yazı tipi yapılandırması) — süreç başına bir kez"""
+    from weasyprint import CSS
+    from weasyprint.text.fonts import FontConfiguration
+    font_config = FontConfiguration()
+    return CSS(string=_read_template_file("invoice.css"), font_config=font_config), font_config
+
+
+def _layout(rendered_html: str):
+    """HTML'i faturanın stil ve yazı tipleriyle yerleştirir (weasyprint Document)"""
+    from weasyprint import HTML
+    stylesheet, font_config = invoice_styles()
+    return HTML(string=rendered_html, base_url=BASE_DIR).render(
+        stylesheets=[stylesheet],
+        font_config=font_config,
+    )
+
+
+# --------------------- Fatura Verisi ---------------------
+
+def build_invoice_context(invoice, customer, items):
+    """ORM nesnelerinden şablonun ihtiyaç duyduğu sade veriyi çıkarır"""
+    return {
+        "invoice": {
+            "id": invoice.id,
+            "fatura_no": invoice.fatura_no,
+            "date": invoice.date,
+            "subtotal": invoice.subtotal,
+            "vat_total": invoice.vat_total,
+            "discount_total": invoice.discount_total,
+            "grand_total": invoice.grand_total,
+        },
+        "customer": {
+            "name": customer.name,
+            "tax_number": customer.tax_number,
+            "address": customer.address,
+        },
+        "items": [
+            {
+                # Ürün sonradan silinmiş olabilir: fatura yine basılır
+                "product": {
+                    "barcode": item.product.barcode if item.product is not None else None,
+                    "name": item.product.name if item.product is not None else "-",
+                },
+                "quantity": item.quantity,
+                "unit_price": item.unit_price,
+                "discount_rate": item.discount_rate,
+                "vat_rate": item.vat_rate,
+                "line_total": item.line_total,
+            }
+            for item in items
+        ],
+        # Faturada zorunlu KDV dökümü: oran başına matrah ve KDV
+        "vat_breakdown": vat_breakdown(price_stored_items(items)),
+        "logo_path": get_logo_path(),
+    }
+
+
+def invoice_fingerprint(context) -> str:
+    """Fatura içeriğinin hash'i — PDF önbelleğinin anahtarı"""
+    payload = json.dumps(context, sort_keys=True, default=str, ensure_ascii=False)
+    digest = hashlib.sha256(f"{TEMPLATE_VERSION}:{payload}".encode("utf-8")).hexdigest()
+    return digest
+
+
+def pdf_etag(context) -> str:
+    """
+    PDF için zayıf ETag: aynı içerik her zaman aynı görünümü üretir, ancak
+    PDF baytları (oluşturma zamanı vb.) render'dan render'a değişebilir.
+    """
+    return f'W/"{invoice_fingerprint(context)}"'
+
+
+# --------------------- PDF Oluşturucu ---------------------
+
+def render_invoice_pdf_timed(context) -> tuple[bytes, dict[str, float]]:
+    """
+    PDF'i üretir ve aşama sürelerini döner (şablon, yerleşim, PDF yazımı).
+    İşçi süreçte çalıştığında süreler çağıran sürece bu dönüşle taşınır.
+    """
+    timings = {}
+    started = time.perf_counter()
+    rendered_html = invoice_template().render(**context)
+    timings["pdf-template"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    document = _layout(rendered_html)
+    timings["pdf-layout"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    pdf_bytes = document.write_pdf()
+    timings["pdf-write"] = time.perf_counter() - started
+    return pdf_bytes, timings
+
+
+def render_invoice_pdf(context) -> bytes:
+    """HTML + CSS tabanlı PDF çıktısını bellekte üretir"""
+    pdf_bytes, timings = render_invoice_pdf_timed(context)
+    record_spans(timings)
+    return pdf_bytes
+
+
+def render_merged_pdf(contexts) -> bytes:
+    """Birden çok faturayı tek PDF belgesinde birleştirir (aynı stil ve yazı tipleriyle)"""
+    template = invoice_template()
+    documents = [_layout(template.render(**context)) for context in contexts]
+    pages = [page for document in documents for page in document.pages]
+    return documents[0].copy(pages).write_pdf()
+
+
+def warm_up():
+    """WeasyPrint'i, şablonu, stili ve yazı tiplerini küçük bir belgeyle önceden yükler"""
+    invoice_template()
+    _layout("<p>MFP</p>").write_pdf()
+
+
+def generate_invoice_pdf(invoice, customer, items) -> bytes:
+    """Faturanın PDF'ini önbellekten döner, yoksa üretip önbelleğe yazar"""
+    context = build_invoice_context(invoice, customer, items)
+    key = invoice_fingerprint(context)
+
+    pdf_bytes = pdf_cache.get(key)
+    if pdf_bytes is None:
+        pdf_bytes = render_invoice_pdf(context)
+        pdf_cache.put(key, pdf_bytes)
+    return pdf_bytes
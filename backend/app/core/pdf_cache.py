@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+import os
+import threading
+from collections import OrderedDict
+from app.core.config import settings
+
+
+class PdfCache:
+    """
+    Hazır PDF'ler için iki katmanlı (bellek + disk) sınırlı önbellek.
+
+    Anahtar, fatura / müşteri / satır verisinin hash'idir; veri değişmedikçe
+    aynı faturanın tekrar indirilmesi WeasyPrint yerleşimine hiç uğramaz.
+    """
+
+    def __init__(self, directory: str | None, max_memory_items: int,
+                 max_memory_bytes: int, max_disk_bytes: int):
+        self.directory = directory
+        self.max_memory_items = max_memory_items
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._disk_bytes: int | None = None  # ilk yazımda hesaplanır
+
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    # ------------------ Okuma ------------------
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                return data
+
+        data = self._read_disk(key)
+        if data is not None:
+            self._remember(key, data)
+        return data
+
+    # ------------------ Yazma ------------------
+
+    def put(self, key: str, data: bytes):
+        self._remember(key, data)
+        self._write_disk(key, data)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    # ------------------ Bellek Katmanı ------------------
+
+    def _remember(self, key: str, data: bytes):
+        if self.max_memory_items <= 0 or len(data) > self.max_memory_bytes:
+            return
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= len(old)
+            self._memory[key] = data
+            self._memory_bytes += len(data)
+
+            # LRU tahliye: en eski kullanılanlar önce çıkar
+            while (len(self._memory) > self.max_memory_items
+                   or self._memory_bytes > self.max_memory_bytes):
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    # ------------------ Disk Katmanı ------------------
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def _read_disk(self, key: str) -> bytes | None:
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # LRU için son kullanım zamanını güncelle
+            return data
+        except OSError:
+            return None
+
+    def _write_disk(self, key: str, data: bytes):
+        if not self.directory or self.max_disk_bytes <= 0:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            # Atomik yer değiştirme: eşzamanlı yazımlar birbirini bozmaz
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._scan_disk())
+            else:
+                self._disk_bytes += len(data)
+            over_budget = self._disk_bytes > self.max_disk_bytes
+        if over_budget:
+            self._evict_disk()
+
+    def _scan_disk(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(".pdf"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict_disk(self):
+        """Disk bütçesi aşılınca en eski dosyaları bütçenin %90'ına inene kadar siler"""
+        entries = sorted(self._scan_disk(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_disk_bytes * 0.9)
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+        with self._lock:
+            self._disk_bytes = total
+
+
+pdf_cache = PdfCache(
+    directory=settings.pdf_cache_dir,
+    max_memory_items=settings.pdf_cache_memory_items,
+    max_memory_bytes=settings.pdf_cache_memory_bytes,
+    max_disk_bytes=settings.pdf_cache_disk_bytes,
+)
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import io
+import zipfile
+from datetime import date
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.pdf import build_invoice_context
+from app.core.pdf_pool import generate_invoice_pdf_async
+from app.database import SessionLocal
+from app.models.invoice import Invoice, invoice_detail_query, invoice_filters
+
+
+# ------------------ Fatura Seçimi ------------------
+
+def select_invoice_ids(db, customer_id: int | None, date_from: date | None, date_to: date | None):
+    """Müşteri ve / veya tarih aralığına uyan fatura id'leri (tarih sırasıyla)"""
+    query = db.query(Invoice.id).filter(*invoice_filters(customer_id, date_from, date_to))
+    return [invoice_id for (invoice_id,) in query.order_by(Invoice.date, Invoice.id)]
+
+
+def load_invoice_contexts(invoice_ids) -> list:
+    """Verilen faturaların şablon verisini tek sorguda okur (istek sırası korunur)"""
+    db = SessionLocal()
+    try:
+        invoices = invoice_detail_query(db).filter(Invoice.id.in_(invoice_ids)).all()
+        by_id = {invoice.id: invoice for invoice in invoices}
+        return [
+            build_invoice_context(by_id[invoice_id], by_id[invoice_id].customer, by_id[invoice_id].items)
+            for invoice_id in invoice_ids
+            if invoice_id in by_id
+        ]
+    finally:
+        db.close()
+
+
+# ------------------ ZIP Akışı ------------------
+
+class _ZipBuffer(io.RawIOBase):
+    """zipfile'ın yazdığı baytları biriktirir; akış her dosyadan sonra boşaltılır"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def stream_invoice_zip(invoice_ids):
+    """
+    Faturaları tek tek PDF'e çevirip ZIP olarak akıtır.
+
+    Bellekte en fazla bir okuma partisi (pdf_export_batch) ve o partinin
+    PDF'leri tutulur; binlerce faturada da kullanım sabit kalır.
+    """
+    buffer = _ZipBuffer()
+    archive = zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED)
+    batch_size = max(1, settings.pdf_export_batch)
+
+    for start in range(0, len(invoice_ids), batch_size):
+        contexts = await run_in_threadpool(load_invoice_contexts, invoice_ids[start:start + batch_size])
+        # Parti içindeki PDF'ler en fazla işçi sayısı kadar paralel üretilir;
+        # etkileşimli PDF istekleri için kuyrukta yer kalır
+        pdfs = await asyncio.gather(*(generate_invoice_pdf_async(ctx, wait=True) for ctx in contexts))
+        for context, pdf_bytes in zip(contexts, pdfs):
+            name = f"{context['invoice']['fatura_no'] or context['invoice']['id']}.pdf"
+            archive.writestr(name, pdf_bytes)
+            yield buffer.drain()
+
+    archive.close()
+    yield buffer.drain()
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import insert, update, or_, and_
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.pdf import generate_invoice_pdf, warm_up
+from app.database import SessionLocal
+from app.models.invoice import Invoice, invoice_detail_query
+from app.models.pdf_job import PdfJob, PdfJobStatus
+
+logger = logging.getLogger(__name__)
+
+
+# ------------------ Kuyruğa Ekleme ------------------
+
+def enqueue_pdf_job(db: Session, invoice_id: int) -> PdfJob:
+    """Fatura için PDF işi ekler; commit çağırana aittir (fatura ile aynı işlem)"""
+    job = PdfJob(invoice_id=invoice_id, status=PdfJobStatus.pending)
+    db.add(job)
+    return job
+
+
+def enqueue_pdf_jobs(db: Session, invoice_ids) -> dict[int, int]:
+    """Toplu ekleme; {invoice_id: job_id} döner, commit çağırana aittir"""
+    if not invoice_ids:
+        return {}
+    rows = db.execute(
+        insert(PdfJob).returning(PdfJob.id, PdfJob.invoice_id),
+        [dict(invoice_id=invoice_id, status=PdfJobStatus.pending) for invoice_id in invoice_ids],
+    )
+    return {invoice_id: job_id for job_id, invoice_id in rows}
+
+
+# ------------------ İş Alma / Bitirme ------------------
+
+def claim_next_job(db: Session, worker_id: str) -> PdfJob | None:
+    """
+    Sıradaki işi atomik olarak üstlenir.
+
+    Bekleyen işler ve zaman aşımına uğramış "running" işler (çöken işçi)
+    adaydır; koşullu UPDATE sayesinde aynı işi iki işçi birden alamaz.
+    Deneme hakkı dolmuş zaman aşımlı işler yeniden alınmaz, başarısız sayılır.
+    """
+    stale_before = datetime.now() - timedelta(seconds=settings.pdf_job_timeout)
+    fail_exhausted_jobs(db, stale_before)
+    candidates = (
+        db.query(PdfJob.id, PdfJob.status, PdfJob.attempts)
+        .filter(or_(
+            PdfJob.status == PdfJobStatus.pending,
+            and_(
+                PdfJob.status == PdfJobStatus.running,
+                PdfJob.started_at < stale_before,
+                PdfJob.attempts < settings.pdf_job_max_attempts,
+            ),
+        ))
+        .order_by(PdfJob.id)
+        .limit(10)
+        .all()
+    )
+    for job_id, observed_status, observed_attempts in candidates:
+        job = try_claim_job(db, worker_id, job_id, observed_status, observed_attempts)
+        if job is not None:
+            return job
+    return None
+
+
+def try_claim_job(db: Session, worker_id: str, job_id: int, observed_status, observed_attempts: int) -> PdfJob | None:
+    """
+    Okunan durum hâlâ geçerliyse işi üstlenir (karşılaştır-ve-değiştir).
+    Zaman aşımlı "running" iş yeniden alınırken durum değişmez; deneme sayısı
+    koşulu olmadan aynı işi okuyan iki işçi de başarılı olurdu.
+    """
+    result = db.execute(
+        update(PdfJob)
+        .where(
+            PdfJob.id == job_id,
+            PdfJob.status == observed_status,
+            PdfJob.attempts == observed_attempts,
+        )
+        .values(
+            status=PdfJobStatus.running,
+            worker=worker_id,
+            attempts=PdfJob.attempts + 1,
+            started_at=datetime.now(),
+        )
+    )
+    db.commit()
+    if result.rowcount == 1:
+        return db.get(PdfJob, job_id)
+    return None
+
+
+def fail_exhausted_jobs(db: Session, stale_before: datetime) -> int:
+    """Her denemede işçiyi çökerten iş sonsuza dek yeniden alınmasın: başarısız işaretlenir"""
+    stale = and_(
+        PdfJob.status == PdfJobStatus.running,
+        PdfJob.started_at < stale_before,
+        PdfJob.attempts >= settings.pdf_job_max_attempts,
+    )
+    # Önce okuma: boş kuyrukta her yoklamada yazma kilidi alınmasın
+    job_ids = db.query(PdfJob.id).filter(stale).limit(100).all()
+    if not job_ids:
+        return 0
+    result = db.execute(
+        update(PdfJob)
+        .where(PdfJob.id.in_([job_id for job_id, in job_ids]), stale)
+        .values(
+            status=PdfJobStatus.failed,
+            error="Zaman aşımı: deneme hakkı doldu",
+            finished_at=datetime.now(),
+        )
+    )
+    db.commit()
+    logger.warning("Deneme hakkı dolan %d PDF işi başarısız işaretlendi", result.rowcount)
+    return result.rowcount
+
+
+def finish_job(db: Session, job: PdfJob, error: str | None = None):
+    """İşi tamamlandı / başarısız olarak işaretler; deneme hakkı varsa geri kuyruğa koyar"""
+    job.finished_at = datetime.now()
+    if error is None:
+        job.status = PdfJobStatus.done
+        job.error = None
+    elif job.attempts < settings.pdf_job_max_attempts:
+        job.status = PdfJobStatus.pending
+        job.error = error
+    else:
+        job.status = PdfJobStatus.failed
+        job.error = error
+    db.commit()
+
+
+# ------------------ İşçi Döngüsü ------------------
+
+def process_job(db: Session, job: PdfJob):
+    """Faturanın PDF'ini üretip paylaşılan PDF önbelleğine yazar"""
+    invoice = invoice_detail_query(db).filter(Invoice.id == job.invoice_id).first()
+    if invoice is None:
+        raise LookupError(f"Fatura bulunamadı: {job.invoice_id}")
+    generate_invoice_pdf(invoice, invoice.customer, invoice.items)
+
+
+def run_worker(once: bool = False):
+    """Kuyruğu boşaltan işçi; once=True ise kuyruk bitince döner"""
+    # Üretilen PDF web süreçlerine yalnız paylaşılan disk önbelleğiyle ulaşır;
+    # önbellek yalnız bellekteyse işler "done" olur ama PDF kaybolur
+    if not settings.pdf_cache_dir:
+        raise RuntimeError("PDF işçisi için MFP_PDF_CACHE_DIR (paylaşılan disk önbelleği) gerekli")
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    logger.info("PDF işçisi başladı: %s", worker_id)
+    # Ayrılmış PDF süreci: WeasyPrint ilk işte değil, açılışta yüklenir
+    warm_up()
+
+    while True:
+        db = SessionLocal()
+        try:
+            job = claim_next_job(db, worker_id)
+            if job is not None:
+                try:
+                    process_job(db, job)
+                except Exception as exc:
+                    logger.exception("PDF işi başarısız: %s", job.id)
+                    db.rollback()
+                    finish_job(db, job, error=str(exc) or exc.__class__.__name__)
+                else:
+                    finish_job(db, job)
+        finally:
+            db.close()
+
+        if job is None:
+            if once:
+                return
+            time.sleep(settings.pdf_job_poll_interval)
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.pdf import render_invoice_pdf_timed, invoice_fingerprint, warm_up
+from app.core.metrics import record_spans
+from app.core.pdf_cache import pdf_cache
+
+
+class RenderQueueFull(Exception):
+    """Bekleyen PDF işi sayısı sınıra ulaştı"""
+
+
+def _init_worker():
+    """İşçi süreç başlarken şablon, stil ve yazı tiplerini belleğe alır"""
+    warm_up()
+
+
+class PdfRenderPool:
+    """
+    WeasyPrint yerleşimini istek işçisinden ayıran süreç havuzu.
+
+    İşler sade sözlük (build_invoice_context çıktısı) olarak gönderilir,
+    PDF baytları geri döner. workers=0 ise havuz açılmaz ve iş threadpool'da
+    yapılır (geliştirme ve testler için).
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._bulk: tuple[asyncio.AbstractEventLoop, asyncio.Semaphore] | None = None
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    # ------------------ Yaşam Döngüsü ------------------
+
+    def start(self):
+        if self.workers <= 0 or self._executor is not None:
+            return
+        # spawn: Windows ile aynı davranış, thread'li süreçten fork riski yok
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+        # İşçileri istek gelmeden önce ayağa kaldır
+        for _ in range(self.workers):
+            self._executor.submit(int)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    # ------------------ İş Gönderme ------------------
+
+    async def run(self, fn, *args, wait: bool = False):
+        """
+        fn(*args)'ı işçi süreçte çalıştırır.
+
+        wait=False (etkileşimli istek): kuyruk doluysa RenderQueueFull.
+        wait=True (toplu dışa aktarma): kuyruğa takılmaz, ayrı semaforla en
+        fazla işçi sayısı kadar eşzamanlı çalışır ve sırası gelene kadar
+        bekler; böylece kuyrukta etkileşimli istekler için hep yer kalır.
+        """
+        if wait:
+            async with self._bulk_slots():
+                with self._lock:
+                    self._pending += 1
+                return await self._submit(fn, *args)
+
+        with self._lock:
+            if self._pending >= self.max_queue:
+                raise RenderQueueFull()
+            self._pending += 1
+        return await self._submit(fn, *args)
+
+    async def _submit(self, fn, *args):
+        """Sayaç çağıran tarafından artırılmış olarak işi çalıştırır ve sayacı düşürür"""
+        try:
+            if self._executor is None:
+                return await run_in_threadpool(fn, *args)
+            executor = self._executor
+            try:
+                return await asyncio.wrap_future(executor.submit(fn, *args))
+            except BrokenProcessPool:
+                # Çöken işçi havuzu sonraki istekler için yeniden kurulur
+                if self._executor is executor:
+                    self.shutdown()
+                    self.start()
+                raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _bulk_slots(self) -> asyncio.Semaphore:
+        """Toplu işlerin semaforu; asyncio nesneleri döngüye bağlı olduğundan döngü başına kurulur"""
+        loop = asyncio.get_running_loop()
+        if self._bulk is None or self._bulk[0] is not loop:
+            self._bulk = (loop, asyncio.Semaphore(max(1, self.workers)))
+        return self._bulk[1]
+
+    async def render(self, context, wait: bool = False) -> bytes:
+        pdf_bytes, timings = await self.run(render_invoice_pdf_timed, context, wait=wait)
+        record_spans(timings)  # işçideki aşama süreleri bu isteğin ölçümlerine
+        return pdf_bytes
+
+
+pdf_pool = PdfRenderPool(workers=settings.pdf_workers, max_queue=settings.pdf_max_queue)
+
+
+def queue_full_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="PDF kuyruğu dolu, lütfen biraz sonra tekrar deneyin.",
+        headers={"Retry-After": str(settings.pdf_retry_after)},
+    )
+
+
+async def generate_invoice_pdf_async(context, wait: bool = False) -> bytes:
+    """generate_invoice_pdf'in havuzlu karşılığı: önbellek, yoksa işçi süreç"""
+    key = invoice_fingerprint(context)
+
+    pdf_bytes = await run_in_threadpool(pdf_cache.get, key)
+    if pdf_bytes is None:
+        try:
+            pdf_bytes = await pdf_pool.render(context, wait=wait)
+        except RenderQueueFull:
+            raise queue_full_error()
+        await run_in_threadpool(pdf_cache.put, key, pdf_bytes)
+    return pdf_bytes
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Fatura tutarlarının hesaplandığı tek yer.
+
+Tüm tutarlar tam sayı kuruş olarak hesaplanır; birim fiyat tam
+duyarlıkta Decimal kalır (0,333 TL gibi kuruş altı fiyatlar yuvarlanmaz),
+oran ve miktar çarpımları Decimal ile yapılıp yalnız satır tutarları
+(brüt, iskonto, KDV) yarım yukarı (ROUND_HALF_UP) kuruşa yuvarlanır.
+Böylece satırlar toplamlara kuruşu kuruşuna eşit olur ve float birikim
+hatası oluşmaz. Veritabanı sütunları Float kaldığı için
+sonuçlar yazılırken kuruş / 100 olarak verilir.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+
+HUNDRED = Decimal(100)
+
+
+def to_decimal(amount) -> Decimal:
+    """float / str / Decimal → Decimal (float'ın görünen değeriyle, ikili hata taşımadan)"""
+    return Decimal(str(amount or 0))
+
+
+def to_tl(kurus: int) -> float:
+    return kurus / 100
+
+
+def _percent(kurus: int, rate: Decimal) -> int:
+    """kurus × oran / 100, kuruşa yuvarlanmış"""
+    return int((kurus * rate / HUNDRED).to_integral_value(ROUND_HALF_UP))
+
+
+# --------------------- Satır ---------------------
+
+class PricedLine:
+    """Hesaplanmış fatura satırı; tutarlar kuruş"""
+    __slots__ = (
+        "invoice_index", "product_id", "quantity", "unit_price",
+        "discount_rate", "vat_rate", "subtotal", "discount", "vat", "total",
+    )
+
+    def __init__(self, invoice_index, product_id, quantity, unit_price, discount_rate, vat_rate):
+        self.invoice_index = invoice_index
+        self.product_id = product_id
+        self.quantity = quantity
+        self.unit_price = unit_price          # TL, Decimal; kuruş altı fiyatlar yuvarlanmaz
+        self.discount_rate = discount_rate
+        self.vat_rate = vat_rate
+
+        quantity_d = Decimal(str(quantity))
+        # Yalnız satır tutarları kuruşa yuvarlanır, birim fiyat tam hassasiyetle çarpılır
+        self.subtotal = int((unit_price * quantity_d * HUNDRED).to_integral_value(ROUND_HALF_UP))
+        self.discount = _percent(self.subtotal, Decimal(str(discount_rate)))
+        self.vat = _percent(self.subtotal - self.discount, Decimal(str(vat_rate)))
+        self.total = self.subtotal - self.discount + self.vat
+
+    @property
+    def base(self) -> int:
+        """KDV matrahı: iskonto sonrası tutar"""
+        return self.subtotal - self.discount
+
+    def item_row(self) -> dict:
+        """invoice_items tablosuna yazılacak değerler"""
+        return dict(
+            product_id=self.product_id,
+            quantity=self.quantity,
+            unit_price=float(self.unit_price),
+            discount_rate=self.discount_rate,
+            vat_rate=self.vat_rate,
+            line_total=to_tl(self.total),
+        )
+
+
+class PricedInvoice:
+    """Bir faturanın satırları, toplamları ve KDV oranı bazında dökümü (kuruş)"""
+    __slots__ = ("lines", "subtotal", "discount", "vat", "total")
+
+    def __init__(self):
+        self.lines: list[PricedLine] = []
+        self.subtotal = 0
+        self.discount = 0
+        self.vat = 0
+        self.total = 0
+
+    def add(self, line: PricedLine):
+        self.lines.append(line)
+        self.subtotal += line.subtotal
+        self.discount += line.discount
+        self.vat += line.vat
+        self.total += line.total
+
+    def item_rows(self) -> list[dict]:
+        return [line.item_row() for line in self.lines]
+
+    def totals(self) -> dict:
+        """invoices tablosuna yazılacak toplamlar"""
+        return dict(
+            subtotal=to_tl(self.subtotal),
+            discount_total=to_tl(self.discount),
+            vat_total=to_tl(self.vat),
+            grand_total=to_tl(self.total),
+        )
+
+    def vat_breakdown(self) -> list[dict]:
+        return vat_breakdown(self.lines)
+
+
+def vat_breakdown(lines) -> list[dict]:
+    """KDV oranı başına matrah ve KDV tutarı (TL), orana göre sıralı"""
+    by_rate: dict[float, list[int]] = {}
+    for line in lines:
+        totals = by_rate.setdefault(line.vat_rate, [0, 0])
+        totals[0] += line.base
+        totals[1] += line.vat
+    return [
+        {"vat_rate": rate, "base": to_tl(base), "vat": to_tl(vat)}
+        for rate, (base, vat) in sorted(by_rate.items())
+    ]
+
+
+# --------------------- Toplu Hesaplama ---------------------
+
+def price_invoices(invoices_lines, products) -> list[PricedInvoice]:
+    """
+    Birden çok faturanın satırlarını tek geçişte hesaplar.
+
+    invoices_lines: her fatura için InvoiceItemCreate listesi
+    products: product_id → CatalogProduct (unit_price TL, vat_rate float)
+    Katalogda olmayan ürünün satırı atlanır. Ürün fiyatı partide bir kez
+    Decimal'e çevrilir (kuruşa yuvarlanmaz: 0,333 TL gibi fiyatlar korunur).
+    """
+    priced = [PricedInvoice() for _ in invoices_lines]
+    unit_prices: dict[int, Decimal] = {}
+
+    for index, lines in enumerate(invoices_lines):
+        invoice = priced[index]
+        for line in lines:
+            product = products.get(line.product_id)
+            if product is None:
+                continue
+            unit_price = unit_prices.get(product.id)
+            if unit_price is None:
+                unit_price = unit_prices[product.id] = to_decimal(product.unit_price)
+            invoice.add(PricedLine(
+                index,
+                product.id,
+                float(line.quantity or 0),
+                unit_price,
+                float(line.discount_rate or 0),
+                product.vat_rate,
+            ))
+    return priced
+
+
+def price_stored_items(items) -> list[PricedLine]:
+    """Kayıtlı fatura satırlarını (ORM) aynı kurallarla yeniden hesaplar — PDF dökümü için"""
+    return [
+        PricedLine(
+            0,
+            item.product_id,
+            float(item.quantity or 0),
+            to_decimal(item.unit_price),
+            float(item.discount_rate or 0),
+            float(item.vat_rate or 0),
+        )
+        for item in items
+    ]
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from app.core.config import settings
+from app.models.user import User, RoleEnum
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Token sahibinin değişmez, hafif özeti — yetki kontrolü için ORM nesnesi gerekmez"""
+    id: int
+    username: str
+    email: str
+    role: RoleEnum
+    customer_id: int | None
+
+
+class PrincipalCache:
+    """
+    Token → Principal önbelleği (TTL'li, sınırlı).
+
+    Kayıt en geç token'ın süresi dolunca düşer; kullanıcı güncellenir veya
+    silinirse invalidate_user ile hemen düşürülür.
+    """
+
+    def __init__(self, ttl: int, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Principal]] = OrderedDict()
+        self._tokens_by_user: dict[int, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Principal | None:
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+        expires_at, principal = entry
+        if expires_at <= time.monotonic():
+            with self._lock:
+                self._drop(token)
+            return None
+        return principal
+
+    def put(self, token: str, principal: Principal, token_exp: float | None = None):
+        if self.ttl <= 0:
+            return
+        ttl = self.ttl
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+            if ttl <= 0:
+                return
+        with self._lock:
+            self._drop(token)
+            self._entries[token] = (time.monotonic() + ttl, principal)
+            self._tokens_by_user.setdefault(principal.id, set()).add(token)
+            # Ekleme sırası ≈ bitiş sırası: en eskiler önce çıkar
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            for token in self._tokens_by_user.pop(user_id, ()):
+                self._entries.pop(token, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def _drop(self, token: str):
+        entry = self._entries.pop(token, None)
+        if entry is not None:
+            tokens = self._tokens_by_user.get(entry[1].id)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._tokens_by_user[entry[1].id]
+
+
+principal_cache = PrincipalCache(ttl=settings.principal_cache_ttl, max_entries=settings.principal_cache_size)
+
+
+# ------------------ Otomatik Geçersiz Kılma ------------------
+# Rol / müşteri değişikliği ya da silme hangi koddan yapılırsa yapılsın
+# (ORM üzerinden) önbellekteki özet düşürülür. Değişen kullanıcılar flush
+# sırasında oturuma not edilir, önbellekten commit'ten sonra düşülür: commit
+# öncesi düşülürse araya giren bir istek eski satırı yeniden önbelleğe
+# alabilir, geri alınan işlemde ise düşürmeye gerek yoktur. Toplu
+# UPDATE/DELETE sorguları bu olayları tetiklemez; onlardan sonra
+# principal_cache.clear() çağrılmalı.
+
+_CHANGED_USERS = "mfp_changed_user_ids"
+
+
+def _remember_user(target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_CHANGED_USERS, set()).add(target.id)
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target):
+    _remember_user(target)
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target):
+    _remember_user(target)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    for user_id in session.info.pop(_CHANGED_USERS, ()):
+        principal_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_changed_users(session, previous_transaction):
+    # Yalnız en dıştaki işlem geri alındığında (savepoint'te dış işlemin değişiklikleri sürer)
+    if previous_transaction.parent is None:
+        session.info.pop(_CHANGED_USERS, None)
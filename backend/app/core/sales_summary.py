@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+from collections import defaultdict
+from datetime import date
+from sqlalchemy import select, delete, func, update, insert
+from sqlalchemy.orm import Session
+from app.models.customer import Customer
+from app.models.invoice import Invoice, InvoiceItem, invoice_filters
+from app.models.product import Product
+from app.models.sales_summary import SalesDailyCustomer, SalesDailyProduct
+from app.core.pricing import price_stored_items, to_tl
+
+CUSTOMER_TOTALS = ("invoice_count", "subtotal", "discount_total", "vat_total", "grand_total")
+PRODUCT_TOTALS = ("line_count", "quantity", "subtotal", "discount_total", "vat_total", "line_total")
+PRODUCT_AMOUNTS = ("subtotal", "discount_total", "vat_total", "line_total")     # kuruş toplanır, TL yazılır
+REBUILD_FETCH_SIZE = 5000
+
+
+# ------------------ Artımlı Güncelleme ------------------
+
+def record_invoice_sales(db: Session, entries):
+    """
+    Yeni faturaları özet tablolara ekler; commit çağırana aittir (fatura ile aynı işlem).
+
+    entries: [(fatura satırı, PricedLine listesi)] — fatura satırında date,
+    customer_id ve toplamlar bulunur; kalem tutarları pricing'den kuruş gelir.
+    """
+    by_customer = defaultdict(lambda: dict.fromkeys(CUSTOMER_TOTALS, 0))
+    by_product = defaultdict(lambda: dict.fromkeys(PRODUCT_TOTALS, 0))
+
+    for invoice_row, lines in entries:
+        day = invoice_row["date"].date()
+        totals = by_customer[(day, invoice_row["customer_id"])]
+        totals["invoice_count"] += 1
+        for name in CUSTOMER_TOTALS[1:]:
+            totals[name] += invoice_row[name]
+        for line in lines:
+            _add_product_line(by_product[(day, line.product_id)], line)
+
+    _upsert_totals(db, SalesDailyCustomer, ("day", "customer_id"), by_customer)
+    _upsert_totals(db, SalesDailyProduct, ("day", "product_id"), _amounts_in_tl(by_product))
+
+
+def _add_product_line(totals: dict, line):
+    """PricedLine'ı ürün toplamına ekler; tutarlar kuruş olarak toplanır"""
+    totals["line_count"] += 1
+    totals["quantity"] += line.quantity
+    totals["subtotal"] += line.subtotal
+    totals["discount_total"] += line.discount
+    totals["vat_total"] += line.vat
+    totals["line_total"] += line.total
+
+
+def _amounts_in_tl(by_product: dict) -> dict:
+    for totals in by_product.values():
+        for name in PRODUCT_AMOUNTS:
+            totals[name] = to_tl(totals[name])
+    return by_product
+
+
+def _upsert_totals(db: Session, model, keys, totals_by_key):
+    """Anahtar varsa toplamların üzerine ekler, yoksa satırı oluşturur"""
+    if not totals_by_key:
+        return
+    # Sabit sıra: eşzamanlı işlemler satır kilitlerini aynı sırayla alır
+    rows = [dict(zip(keys, key), **totals) for key, totals in sorted(totals_by_key.items())]
+    table = model.__table__
+    value_names = [name for name in rows[0] if name not in keys]
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        # ON CONFLICT desteklemeyen veritabanı: önce güncelle, yoksa ekle
+        for row in rows:
+            result = db.execute(
+                update(table)
+                .where(*(table.c[key] == row[key] for key in keys))
+                .values({name: table.c[name] + row[name] for name in value_names})
+            )
+            if result.rowcount == 0:
+                db.execute(insert(table).values(row))
+        return
+
+    stmt = dialect_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={name: table.c[name] + stmt.excluded[name] for name in value_names},
+    )
+    db.execute(stmt, rows)
+
+
+# ------------------ Yeniden Oluşturma ------------------
+
+def rebuild_sales_summary(db: Session, date_from: date | None = None, date_to: date | None = None):
+    """
+    Özet tabloları faturalardan yeniden hesaplar (ilk kurulum, geçmiş düzeltme).
+    Aralık verilirse yalnız o günler silinip yeniden yazılır. Commit çağırana aittir.
+    """
+    db.execute(delete(SalesDailyCustomer).where(*_range(SalesDailyCustomer, date_from, date_to)))
+    db.execute(delete(SalesDailyProduct).where(*_range(SalesDailyProduct, date_from, date_to)))
+
+    day = func.date(Invoice.date)
+    filters = invoice_filters(date_from=date_from, date_to=date_to)
+
+    customer_rows = (
+        select(
+            day,
+            Invoice.customer_id,
+            func.count(),
+            func.coalesce(func.sum(Invoice.subtotal), 0),
+            func.coalesce(func.sum(Invoice.discount_total), 0),
+            func.coalesce(func.sum(Invoice.vat_total), 0),
+            func.coalesce(func.sum(Invoice.grand_total), 0),
+        )
+        .where(Invoice.customer_id.is_not(None), *filters)
+        .group_by(day, Invoice.customer_id)
+    )
+    db.execute(
+        insert(SalesDailyCustomer.__table__).from_select(("day", "customer_id") + CUSTOMER_TOTALS, customer_rows)
+    )
+
+    # Kalem tutarları pricing ile yeniden hesaplanır (artımlı güncellemeyle aynı
+    # Decimal yuvarlama); SQL round() SQLite'ta float üzerinden yuvarlar
+    item_rows = db.execute(
+        select(
+            Invoice.date,
+            InvoiceItem.product_id,
+            InvoiceItem.quantity,
+            InvoiceItem.unit_price,
+            InvoiceItem.discount_rate,
+            InvoiceItem.vat_rate,
+        )
+        .select_from(InvoiceItem)
+        .join(Invoice, Invoice.id == InvoiceItem.invoice_id)
+        .where(InvoiceItem.product_id.is_not(None), *filters)
+        .execution_options(yield_per=REBUILD_FETCH_SIZE)
+    )
+    by_product = defaultdict(lambda: dict.fromkeys(PRODUCT_TOTALS, 0))
+    for rows in item_rows.partitions():
+        for row, line in zip(rows, price_stored_items(rows)):
+            _add_product_line(by_product[(row.date.date(), row.product_id)], line)
+
+    product_rows = [
+        dict(day=item_day, product_id=product_id, **totals)
+        for (item_day, product_id), totals in sorted(_amounts_in_tl(by_product).items())
+    ]
+    if product_rows:
+        db.execute(insert(SalesDailyProduct.__table__), product_rows)
+
+
+# ------------------ Rapor Sorguları ------------------
+
+def _range(model, date_from, date_to):
+    filters = []
+    if date_from is not None:
+        filters.append(model.day >= date_from)
+    if date_to is not None:
+        filters.append(model.day <= date_to)
+    return filters
+
+
+def _rounded(values: dict) -> dict:
+    return {key: round(value, 2) if isinstance(value, float) else value for key, value in values.items()}
+
+
+def sales_by_day(db: Session, date_from=None, date_to=None, customer_id: int | None = None) -> list[dict]:
+    filters = _range(SalesDailyCustomer, date_from, date_to)
+    if customer_id is not None:
+        filters.append(SalesDailyCustomer.customer_id == customer_id)
+    rows = db.execute(
+        select(
+            SalesDailyCustomer.day,
+            *(func.sum(getattr(SalesDailyCustomer, name)).label(name) for name in CUSTOMER_TOTALS),
+        )
+        .where(*filters)
+        .group_by(SalesDailyCustomer.day)
+        .order_by(SalesDailyCustomer.day)
+    )
+    return [_rounded(dict(row._mapping, period=row.day.isoformat())) for row in rows]
+
+
+def sales_by_month(db: Session, date_from=None, date_to=None, customer_id: int | None = None) -> list[dict]:
+    """Günlük satırlar ayda toplanır (veritabanına özgü tarih fonksiyonu gerekmez)"""
+    months = {}
+    for row in sales_by_day(db, date_from, date_to, customer_id):
+        period = row["period"][:7]  # "YYYY-MM"
+        totals = months.setdefault(period, dict.fromkeys(CUSTOMER_TOTALS, 0))
+        for name in CUSTOMER_TOTALS:
+            totals[name] += row[name]
+    return [_rounded(dict(totals, period=period)) for period, totals in months.items()]
+
+
+def sales_by_customer(db: Session, date_from=None, date_to=None, limit: int = 100) -> list[dict]:
+    grand_total = func.sum(SalesDailyCustomer.grand_total)
+    rows = db.execute(
+        select(
+            SalesDailyCustomer.customer_id,
+            Customer.name.label("customer_name"),
+            func.sum(SalesDailyCustomer.invoice_count).label("invoice_count"),
+            func.sum(SalesDailyCustomer.subtotal).label("subtotal"),
+            func.sum(SalesDailyCustomer.discount_total).label("discount_total"),
+            func.sum(SalesDailyCustomer.vat_total).label("vat_total"),
+            grand_total.label("grand_total"),
+        )
+        .outerjoin(Customer, Customer.id == SalesDailyCustomer.customer_id)
+        .where(*_range(SalesDailyCustomer, date_from, date_to))
+        .group_by(SalesDailyCustomer.customer_id, Customer.name)
+        .order_by(grand_total.desc())
+        .limit(limit)
+    )
+    return [_rounded(dict(row._mapping)) for row in rows]
+
+
+def sales_by_product(db: Session, date_from=None, date_to=None, limit: int = 100) -> list[dict]:
+    line_total = func.sum(SalesDailyProduct.line_total)
+    rows = db.execute(
+        select(
+            SalesDailyProduct.product_id,
+            Product.name.label("product_name"),
+            Product.barcode,
+            func.sum(SalesDailyProduct.line_count).label("line_count"),
+            func.sum(SalesDailyProduct.quantity).label("quantity"),
+            func.sum(SalesDailyProduct.subtotal).label("subtotal"),
+            func.sum(SalesDailyProduct.discount_total).label("discount_total"),
+            func.sum(SalesDailyProduct.vat_total).label("vat_total"),
+            line_total.label("line_total"),
+        )
+        .outerjoin(Product, Product.id == SalesDailyProduct.product_id)
+        .where(*_range(SalesDailyProduct, date_from, date_to))
+        .group_by(SalesDailyProduct.product_id, Product.name, Product.barcode)
+        .order_by(line_total.desc())
+        .limit(limit)
+    )
+    return [_rounded(dict(row._mapping)) for row in rows]
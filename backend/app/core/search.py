@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+import re
+from sqlalchemy import text, select, or_, func, table, literal_column
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+# ------------------ Türkçe Katlama ------------------
+# FTS5 unicode61 + remove_diacritics 2: büyük/küçük harf ve İ, ş, ğ, ç, ö, ü
+# katlanır (Ş → s, İ → i). Noktasız "ı" ise ayrı bir harftir; indekste ve
+# sorguda "i"ye çevrilir ki "kirmizi" araması "Kırmızı"yı bulsun.
+TOKENIZER = "unicode61 remove_diacritics 2"
+
+
+def fold_sql(expr: str) -> str:
+    return f"replace({expr}, 'ı', 'i')"
+
+
+def fold_text(value: str) -> str:
+    return value.replace("ı", "i")
+
+
+def _folded_values(prefix: str, columns) -> str:
+    return ", ".join(fold_sql(f"{prefix}.{column}") for column in columns)
+
+
+# İndekslenen tablolar: FTS tablosu → (kaynak tablo, sütunlar, bm25 ağırlıkları)
+SEARCH_INDEXES = {
+    "products_fts": ("products", ("name", "barcode"), (10.0, 5.0)),
+    "customers_fts": ("customers", ("name", "tax_number", "address"), (10.0, 8.0, 1.0)),
+}
+
+
+# ------------------ Şema ------------------
+
+def ensure_search_indexes(conn: Connection):
+    """
+    FTS5 tablolarını ve eşitleme tetikleyicilerini oluşturur (yalnız SQLite).
+    Tablo yeni oluşturulduysa mevcut kayıtlar bir kerede indekslenir.
+    """
+    if conn.dialect.name != "sqlite":
+        return
+    for fts_table, (source, columns, _) in SEARCH_INDEXES.items():
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": fts_table},
+        ).first()
+        column_list = ", ".join(columns)
+
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} "
+            f"USING fts5({column_list}, tokenize = '{TOKENIZER}')"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {source} BEGIN "
+            f"INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {_folded_values('new', columns)}); END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {source} BEGIN "
+            f"DELETE FROM {fts_table} WHERE rowid = old.id; END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE ON {source} BEGIN "
+            f"DELETE FROM {fts_table} WHERE rowid = old.id; "
+            f"INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {_folded_values('new', columns)}); END"
+        ))
+        if not exists:
+            conn.execute(text(
+                f"INSERT INTO {fts_table}(rowid, {column_list}) "
+                f"SELECT id, {_folded_values(source, columns)} FROM {source}"
+            ))
+
+
+# ------------------ Arama ------------------
+
+def query_terms(query: str) -> list[str]:
+    return re.findall(r"\w+", fold_text(query))
+
+
+def match_expression(terms) -> str:
+    """Her kelime önek olarak aranır: "kirm" → "kirm"*  (tırnak, FTS sözdizimini etkisiz kılar)"""
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search(db: Session, model, fts_table: str, columns, query: str, limit: int, offset: int):
+    """
+    Sorguya uyan kayıtları alaka sırasıyla döner (en iyi eşleşme önce).
+    SQLite dışında FTS yoktur; basit LIKE araması yapılır.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return []
+
+    if db.get_bind().dialect.name != "sqlite":
+        return _search_like(db, model, fts_table, columns, terms, limit, offset)
+
+    _, _, weights = SEARCH_INDEXES[fts_table]
+    # bm25: küçük değer = daha iyi eşleşme; ad sütunu en ağır
+    rank = literal_column(f"bm25({fts_table}, {', '.join(map(str, weights))})").label("rank")
+    hits = (
+        select(literal_column("rowid").label("id"), rank)
+        .select_from(table(fts_table))
+        .where(text(f"{fts_table} MATCH :match"))
+        .order_by(rank)
+        .limit(limit)
+        .offset(offset)
+        .subquery()
+    )
+    stmt = (
+        select(*columns)
+        .join(hits, hits.c.id == model.id)
+        .order_by(hits.c.rank)
+    )
+    rows = db.execute(stmt, {"match": match_expression(terms)})
+    return [dict(row._mapping) for row in rows]
+
+
+def _search_like(db: Session, model, fts_table, columns, terms, limit, offset):
+    _, fts_columns, _ = SEARCH_INDEXES[fts_table]
+    searchable = [getattr(model, name) for name in fts_columns]
+    conditions = [
+        or_(*(func.lower(column).contains(term.lower(), autoescape=True) for column in searchable))
+        for term in terms
+    ]
+    stmt = select(*columns).where(*conditions).order_by(model.id).limit(limit).offset(offset)
+    return [dict(row._mapping) for row in db.execute(stmt)]
@@ -4,9 +4,14 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from app.database import get_db
+from starlette.concurrency import run_in_threadpool
+from app.database import get_async_sessionmaker
 from app.models.user import User, RoleEnum
+from app.core.principals import Principal, principal_cache
+from app.core.config import settings
+from app.core.password_hashing import password_hasher
 
 # ------------------ JWT / Şifreleme Ayarları ------------------
 
@@ -14,7 +19,14 @@ SECRET_KEY = "super-secret-key-change-this"  # ⛔ Gerçek projede ENV’den oku
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 8  # 8 saat oturum süresi
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min = max = varsayılan: farklı maliyetli hash'ler needs_update ile girişte yenilenir
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.bcrypt_rounds,
+    bcrypt__min_rounds=settings.bcrypt_rounds,
+    bcrypt__max_rounds=settings.bcrypt_rounds,
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 # ------------------ Şifre İşlemleri ------------------
@@ -29,6 +41,10 @@ def get_password_hash(password: str):
     password = password[:72]
     return pwd_context.hash(password)
 
+async def get_password_hash_async(password: str):
+    """get_password_hash'in bcrypt havuzunda çalışan karşılığı"""
+    return await password_hasher.run(get_password_hash, password)
+
 # ------------------ JWT Token Üretimi ------------------
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
@@ -41,8 +57,16 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
 
 # ------------------ Kullanıcı Doğrulama ------------------
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
-    """Token’dan aktif kullanıcıyı döner"""
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> Principal:
+    """
+    Token'dan aktif kullanıcının özetini döner.
+    Önbellekte varsa ne JWT çözülür ne de veritabanına gidilir; yoksa sorgu
+    async oturumla yapılır (threadpool thread'i tutulmaz).
+    """
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Not authenticated",
@@ -56,32 +80,48 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.username == username).first()
-    if user is None:
+    # Sadece gereken sütunlar: customer ilişkisinin JOIN'i yapılmaz
+    async with get_async_sessionmaker()() as db:
+        result = await db.execute(
+            select(User.id, User.username, User.email, User.role, User.customer_id)
+            .where(User.username == username)
+        )
+        row = result.first()
+    if row is None:
         raise credentials_exception
-    return user
+
+    principal = Principal(
+        id=row.id,
+        username=row.username,
+        email=row.email,
+        role=row.role,
+        customer_id=row.customer_id,
+    )
+    principal_cache.put(token, principal, token_exp=payload.get("exp"))
+    return principal
 
 # ------------------ Rol Kontrol Fonksiyonları ------------------
+# async: yalnız bellekte kontrol, threadpool'a gönderilmez
 
-def admin_required(current_user: User = Depends(get_current_user)):
+async def admin_required(current_user: Principal = Depends(get_current_user)):
     """Sadece Admin erişimi"""
     if current_user.role != RoleEnum.admin:
         raise HTTPException(status_code=403, detail="Bu işlem için admin yetkisi gerekli.")
     return current_user
 
-def rep_required(current_user: User = Depends(get_current_user)):
+async def rep_required(current_user: Principal = Depends(get_current_user)):
     """Admin veya Temsilci erişimi"""
     if current_user.role not in [RoleEnum.admin, RoleEnum.representative]:
         raise HTTPException(status_code=403, detail="Bu işlem için temsilci veya admin yetkisi gerekli.")
     return current_user
 
-def customer_required(current_user: User = Depends(get_current_user)):
+async def customer_required(current_user: Principal = Depends(get_current_user)):
     """Sadece müşteri erişimi"""
     if current_user.role != RoleEnum.customer:
         raise HTTPException(status_code=403, detail="Bu işlem yalnızca müşterilere açıktır.")
     return current_user
 
-def viewer_or_higher(current_user: User = Depends(get_current_user)):
+async def viewer_or_higher(current_user: Principal = Depends(get_current_user)):
     """Viewer, Representative, Admin erişimi"""
     if current_user.role not in [RoleEnum.viewer, RoleEnum.representative, RoleEnum.admin]:
         raise HTTPException(status_code=403, detail="Bu işlem yalnızca izleyici ve üzeri roller içindir.")
@@ -89,11 +129,24 @@ def viewer_or_higher(current_user: User = Depends(get_current_user)):
 
 # ------------------ Yardımcı: Token Üretim Yardımcısı ------------------
 
-def authenticate_user(db: Session, username: str, password: str):
-    """Kullanıcı adı ve parolayı doğrular"""
-    user = db.query(User).filter(User.username == username).first()
+async def authenticate_user(db: Session, username: str, password: str):
+    """
+    Kullanıcı adı ve parolayı doğrular.
+    Hash güncel maliyette değilse (needs_update) yeni hash ile değiştirilir.
+    """
+    user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.username == username).first()
+    )
     if not user:
         return None
-    if not verify_password(password, user.password_hash):
+
+    valid, new_hash = await password_hasher.run(pwd_context.verify_and_update, password, user.password_hash)
+    if not valid:
         return None
+
+    if new_hash:
+        def upgrade():
+            user.password_hash = new_hash
+            db.commit()
+        await run_in_threadpool(upgrade)
     return user
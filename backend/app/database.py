@@ -1,14 +1,66 @@
-from sqlalchemy import create_engine
+from functools import lru_cache
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-import os
+from sqlalchemy.pool import StaticPool
+from app.core.config import settings
+
+# Motor ayarları MFP_DATABASE_URL ve MFP_DB_* / MFP_SQLITE_* ortam değişkenlerinden gelir.
+# Varsayılan: bu dosyayla aynı klasördeki SQLite (mfp.db).
+DATABASE_URL = settings.database_url
+
+
+def engine_options(url: str) -> dict:
+    """Sürücüye göre bağlantı havuzu ve bağlantı ayarları"""
+    url = make_url(url)
+    if url.get_backend_name() != "sqlite":
+        return dict(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_pre_ping=settings.db_pool_pre_ping,
+            pool_recycle=settings.db_pool_recycle,
+        )
+
+    options = dict(connect_args={
+        "check_same_thread": False,
+        "timeout": settings.sqlite_busy_timeout / 1000,
+    })
+    # Bellek içi veritabanı tek bağlantıya bağlıdır: tüm thread'ler aynı bağlantıyı paylaşır
+    if url.database and url.database != ":memory:":
+        options.update(pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow)
+    else:
+        options.update(poolclass=StaticPool)
+    return options
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Her yeni SQLite bağlantısında:
+    WAL → okuyucular yazarı, yazar okuyucuları beklemez;
+    busy_timeout → kilitte hemen hata yerine bekle;
+    synchronous=NORMAL → WAL ile güvenli, her commit'te fsync yok;
+    mmap → okumalar sistem çağrısı yerine bellek eşlemeden.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        if settings.sqlite_wal:
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout)}")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+        cursor.execute(f"PRAGMA cache_size={-int(settings.sqlite_cache_kib)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
 
-# Veritabanı dosyasını bu dosyayla aynı klasöre koy
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATABASE_URL = f"sqlite:///{os.path.join(BASE_DIR, 'mfp.db')}"
 
 # Motor ve session ayarları
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -20,3 +72,41 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# -------------------- Asenkron Motor --------------------
+# Okuma ağırlıklı endpoint'ler için: bekleme süresince threadpool thread'i tutulmaz.
+# Aynı veritabanına async sürücüyle bağlanır (SQLite → aiosqlite, PostgreSQL → asyncpg).
+
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def async_database_url(url: str) -> str:
+    if settings.async_database_url:
+        return settings.async_database_url
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"Async sürücü tanımlı değil: {backend} (MFP_ASYNC_DATABASE_URL verin)")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+@lru_cache(maxsize=None)
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Motor ilk kullanımda kurulur: async sürücü yalnız gerektiğinde yüklenir"""
+    url = async_database_url(DATABASE_URL)
+    async_engine = create_async_engine(url, **engine_options(url))
+    if async_engine.dialect.name == "sqlite":
+        event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+    return async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+async def dispose_async_engine():
+    """Kapanışta async bağlantıları bırakır (motor hiç kurulmadıysa bir şey yapmaz)"""
+    if get_async_sessionmaker.cache_info().currsize:
+        await get_async_sessionmaker().kw["bind"].dispose()
@@ -1,11 +1,32 @@
 # -*- coding: utf-8 -*-
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import Base, engine
-from app.routers import auth, users, customers, products, invoices
+from app.database import Base, engine, dispose_async_engine
+from app.core.config import settings
+from app.routers import auth, users, customers, products, invoices, reports
+from app.core.pdf_pool import pdf_pool
+from app.core.password_hashing import password_hasher
+from app.core.catalog import catalog
+from app.core.metrics import install_metrics, registry
 
-# -------------------- Veritabanı Başlat --------------------
-Base.metadata.create_all(bind=engine)
+# -------------------- Yaşam Döngüsü --------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Şema açılışta güncellenmez (python -m app.migrate); yalnız geliştirmede istenirse
+    if settings.auto_migrate:
+        from app.core.migrations import upgrade
+        upgrade(engine)
+    # PDF işçileri yazı tipleri ve stil yüklü halde hazır beklesin
+    pdf_pool.start()
+    password_hasher.start()
+    # Fiyatlama ilk faturada veritabanına gitmesin
+    catalog.load()
+    yield
+    pdf_pool.shutdown()
+    password_hasher.shutdown()
+    await dispose_async_engine()
 
 # -------------------- Uygulama Nesnesi --------------------
 app = FastAPI(
@@ -16,6 +37,9 @@ app = FastAPI(
         "name": "MFP Developer Team",
         "email": "dev@mfp.com",
     },
+    lifespan=lifespan,
+    # Yanıtlar response_model ile doğrulanıp orjson ile yazılır (jsonable_encoder + json.dumps yerine)
+    default_response_class=ORJSONResponse,
 )
 
 # -------------------- CORS Ayarları --------------------
@@ -34,17 +58,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Sayfalama ve önbellek başlıkları tarayıcıdan okunabilsin
+    expose_headers=["X-Total-Count", "X-Next-Cursor", "Link", "ETag"],
 )
 
+# -------------------- Ölçümler --------------------
+# Süre, SQL sayacı ve Server-Timing; MFP_METRICS_ENABLED=false ise hiç kurulmaz
+install_metrics(app, Base)
+
 # -------------------- Router’ların Dahil Edilmesi --------------------
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(customers.router)
 app.include_router(products.router)
 app.include_router(invoices.router)
+app.include_router(reports.router)
 
 # -------------------- Kök Endpoint --------------------
-@app.get("/")
+@app.get("/", response_model=dict[str, str])
 def root():
     return {
         "message": "🚀 MFP Backend aktif!",
@@ -53,9 +84,18 @@ def root():
         "redoc": "/redoc"
     }
 
+# -------------------- Prometheus --------------------
+@app.get("/metrics", include_in_schema=False, response_class=PlainTextResponse)
+def metrics():
+    gauges = {"mfp_pdf_queue_pending": pdf_pool.pending}
+    for name, value in password_hasher.stats().items():
+        gauges[f"mfp_password_hash_{name}"] = value
+    return PlainTextResponse(registry.render(gauges), media_type="text/plain; version=0.0.4")
+
 # -------------------- Geliştirici Notu --------------------
 """
 Kullanım:
+    python -m app.migrate            # şema geçişleri (kurulum ve sürüm geçişinde)
     uvicorn app.main:app --reload
 
 Örnek API’ler:
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Şema geçişlerini çalıştırır.
+
+Kullanım:
+    python -m app.migrate                # bekleyen tüm geçişleri uygula
+    python -m app.migrate upgrade --to 2 # belirli sürüme kadar
+    python -m app.migrate status         # uygulanmış / bekleyen geçişler
+
+Web ve PDF işçisi süreçleri açılışta şemaya dokunmaz; kurulumda ve her
+sürüm geçişinde, yeni sürüm başlatılmadan önce bu komut çalıştırılır.
+Geçişler yalnız bir kez uygulanır; tekrar çalıştırmak zararsızdır.
+"""
+import argparse
+import logging
+from app.database import engine
+from app.core.migrations import discover_migrations, pending_migrations, upgrade
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MFP şema geçişleri")
+    commands = parser.add_subparsers(dest="command")
+    run = commands.add_parser("upgrade", help="Bekleyen geçişleri uygula (varsayılan)")
+    run.add_argument("--to", dest="target", type=int, help="Bu sürüme kadar")
+    commands.add_parser("status", help="Geçiş durumunu göster")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.command == "status":
+        pending = {migration.version for migration in pending_migrations(engine)}
+        for migration in discover_migrations():
+            state = "bekliyor" if migration.version in pending else "uygulandı"
+            print(f"v{migration.version:04d} {migration.name:30} {state}")
+        return
+
+    done = upgrade(engine, getattr(args, "target", None))
+    if done:
+        print(f"{len(done)} geçiş uygulandı: " + ", ".join(f"v{m.version:04d}" for m in done))
+    else:
+        print("Şema güncel.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+# Sürümlü şema geçişleri: vNNNN_ad.py, her biri upgrade(ctx) tanımlar.
+# Çalıştırma: python -m app.migrate — ayrıntılar app/core/migrations.py
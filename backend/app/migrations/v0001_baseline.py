@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+"""
+Başlangıç şeması: eksik tablolar (kendi indeksleriyle) ve SQLite arama tabloları.
+
+Var olan tablolara dokunulmaz; onlara sonradan eklenen sütun ve indeksler
+sonraki geçişlerdedir. Boş veritabanında tüm şema bu adımda kurulur.
+"""
+from app.database import Base
+from app.core.search import ensure_search_indexes
+import app.models  # noqa: F401  (tüm tablolar metadata'ya kayıtlı olsun)
+
+
+def upgrade(ctx):
+    with ctx.transaction() as conn:
+        Base.metadata.create_all(bind=conn)
+        ensure_search_indexes(conn)
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+"""
+Mevcut veritabanlarına faturalar için sonradan eklenen sütun ve indeksler.
+
+create_all var olan tabloya bunları eklemediğinden eski veritabanlarında
+satırların fatura id'siyle okunması tam tablo taramasıydı. İndeksler
+PostgreSQL'de CONCURRENTLY ile kurulur. users.email ve users.username
+UNIQUE kısıtıyla zaten indekslidir.
+"""
+from sqlalchemy import Column, Integer
+
+
+def upgrade(ctx):
+    ctx.add_column("invoices", Column("catalog_version", Integer, nullable=True))
+    ctx.create_index("ix_invoice_items_invoice_id", "invoice_items", ("invoice_id",))
+    ctx.create_index("ix_invoices_customer_id_date", "invoices", ("customer_id", "date"))
+    # Yalnız tarih aralığıyla (müşterisiz) rapor ve dışa aktarma sorguları için
+    ctx.create_index("ix_invoices_date", "invoices", ("date",))
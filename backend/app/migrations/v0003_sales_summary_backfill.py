@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""
+Satış özet tablolarını geçişten önce kesilmiş faturalardan doldurur.
+
+Her ay ayrı işlemde silinip faturalardan yeniden yazılır: fatura tabloları
+uzun süre kilitlenmez ve yarıda kalan geçiş yeniden çalıştırıldığında
+tamamlanmış aylar da tutarlı biçimde baştan yazılır. Özetlerle birlikte
+kaydedilmiş faturalar da aynı sonucu verdiğinden hiçbir ay atlanmaz.
+"""
+from datetime import date, timedelta
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+from app.core.sales_summary import rebuild_sales_summary
+from app.models.invoice import Invoice
+
+
+def upgrade(ctx):
+    with ctx.transaction() as conn:
+        first, last = conn.execute(select(func.min(Invoice.date), func.max(Invoice.date))).one()
+    if first is None:
+        return
+
+    month = date(first.year, first.month, 1)
+    while month <= last.date():
+        next_month = (month + timedelta(days=32)).replace(day=1)
+        with ctx.transaction() as conn:
+            rebuild_sales_summary(Session(bind=conn), month, next_month - timedelta(days=1))
+        month = next_month
@@ -0,0 +1,5 @@
+# Tüm modeller burada yüklenir: ilişkiler (ör. Invoice → Customer) ve
+# geçişler, router'lar import edilmeden de (işçi, komut satırı) çalışır.
+from app.models import (  # noqa: F401
+    customer, user, product, invoice, invoice_sequence, pdf_job, sales_summary, catalog_version,
+)
@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+from sqlalchemy import Column, Integer
+from app.database import Base
+
+
+class CatalogVersion(Base):
+    """Ürün kataloğunun sürümü (tek satır); ürün eklenip silindikçe artar"""
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
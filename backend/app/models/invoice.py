@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
-from datetime import datetime
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship, joinedload
+from datetime import datetime, date, time, timedelta
 from app.database import Base
 
 
@@ -16,16 +16,24 @@ class Invoice(Base):
     vat_total = Column(Float, default=0.0)
     discount_total = Column(Float, default=0.0)
     grand_total = Column(Float, default=0.0)
+    catalog_version = Column(Integer, nullable=True)  # fiyatların alındığı katalog sürümü
 
     customer = relationship("Customer")
     items = relationship("InvoiceItem", back_populates="invoice", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Müşteri + tarih aralığı listeleme ve dışa aktarma sorguları için
+        Index("ix_invoices_customer_id_date", "customer_id", "date"),
+        # Yalnız tarih aralığıyla rapor ve dışa aktarma sorguları için
+        Index("ix_invoices_date", "date"),
+    )
+
 
 class InvoiceItem(Base):
     __tablename__ = "invoice_items"
 
     id = Column(Integer, primary_key=True, index=True)
-    invoice_id = Column(Integer, ForeignKey("invoices.id"))
+    invoice_id = Column(Integer, ForeignKey("invoices.id"), index=True)
     product_id = Column(Integer, ForeignKey("products.id"))
     quantity = Column(Float, default=0.0)
     unit_price = Column(Float, default=0.0)
@@ -35,3 +43,37 @@ class InvoiceItem(Base):
 
     invoice = relationship("Invoice", back_populates="items")
     product = relationship("Product")
+
+
+def invoice_detail_query(db):
+    """Fatura + müşteri + satırlar + ürünler — tek SELECT, tembel yükleme yok"""
+    return db.query(Invoice).options(
+        joinedload(Invoice.customer),
+        joinedload(Invoice.items).joinedload(InvoiceItem.product),
+    )
+
+
+def invoice_filters(
+    customer_id: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    min_total: float | None = None,
+    max_total: float | None = None,
+    fatura_no_prefix: str | None = None,
+) -> list:
+    """Listeleme / dışa aktarma için WHERE koşulları (verilmeyen filtre atlanır)"""
+    filters = []
+    if customer_id is not None:
+        filters.append(Invoice.customer_id == customer_id)
+    if date_from is not None:
+        filters.append(Invoice.date >= datetime.combine(date_from, time.min))
+    if date_to is not None:
+        # date_to dahil: ertesi günün başından küçük
+        filters.append(Invoice.date < datetime.combine(date_to + timedelta(days=1), time.min))
+    if min_total is not None:
+        filters.append(Invoice.grand_total >= min_total)
+    if max_total is not None:
+        filters.append(Invoice.grand_total <= max_total)
+    if fatura_no_prefix:
+        filters.append(Invoice.fatura_no.startswith(fatura_no_prefix, autoescape=True))
+    return filters
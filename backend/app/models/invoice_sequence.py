@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer
+from app.database import Base
+
+class InvoiceSequence(Base):
+    """Yıl bazında fatura numarası sayacı (FAT-<yıl>-<sıra>)"""
+    __tablename__ = "invoice_sequences"
+
+    year = Column(Integer, primary_key=True)
+    last_value = Column(Integer, nullable=False, default=0)
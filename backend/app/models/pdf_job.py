@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.database import Base
+import enum
+
+
+class PdfJobStatus(str, enum.Enum):
+    pending = "pending"
+    running = "running"
+    done = "done"
+    failed = "failed"
+
+
+class PdfJob(Base):
+    """Arka planda üretilecek fatura PDF'leri için kalıcı iş kuyruğu"""
+    __tablename__ = "pdf_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    invoice_id = Column(Integer, ForeignKey("invoices.id"), nullable=False, index=True)
+    status = Column(Enum(PdfJobStatus), default=PdfJobStatus.pending, nullable=False, index=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    error = Column(String, nullable=True)
+    worker = Column(String, nullable=True)        # işi alan işçinin kimliği
+    created_at = Column(DateTime, default=datetime.now)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    invoice = relationship("Invoice")
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey
+from app.database import Base
+
+
+class SalesDailyCustomer(Base):
+    """Gün + müşteri bazında fatura toplamları (raporlar faturaları taramaz)"""
+    __tablename__ = "sales_daily_customer"
+
+    day = Column(Date, primary_key=True)
+    customer_id = Column(Integer, ForeignKey("customers.id"), primary_key=True, index=True)
+    invoice_count = Column(Integer, nullable=False, default=0)
+    subtotal = Column(Float, nullable=False, default=0.0)
+    discount_total = Column(Float, nullable=False, default=0.0)
+    vat_total = Column(Float, nullable=False, default=0.0)
+    grand_total = Column(Float, nullable=False, default=0.0)
+
+
+class SalesDailyProduct(Base):
+    """Gün + ürün bazında satış toplamları (line_total = iskonto sonrası + KDV)"""
+    __tablename__ = "sales_daily_product"
+
+    day = Column(Date, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True, index=True)
+    line_count = Column(Integer, nullable=False, default=0)
+    quantity = Column(Float, nullable=False, default=0.0)
+    subtotal = Column(Float, nullable=False, default=0.0)
+    discount_total = Column(Float, nullable=False, default=0.0)
+    vat_total = Column(Float, nullable=False, default=0.0)
+    line_total = Column(Float, nullable=False, default=0.0)
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+Satış özet tabloları için bakım komutu.
+
+Kullanım:
+    python -m app.reports rebuild                                # tüm geçmiş
+    python -m app.reports rebuild --from 2025-01-01 --to 2025-01-31
+
+Faturalar kaydedilirken özetler aynı işlemde güncellenir; bu komut yalnız
+ilk kurulumda, eski veriyi aktarırken veya elle düzeltme sonrası gerekir.
+"""
+import argparse
+from datetime import date
+from app.database import SessionLocal, engine
+from app.core.migrations import upgrade
+from app.core.sales_summary import rebuild_sales_summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MFP satış özetleri")
+    commands = parser.add_subparsers(dest="command", required=True)
+    rebuild = commands.add_parser("rebuild", help="Özetleri faturalardan yeniden hesapla")
+    rebuild.add_argument("--from", dest="date_from", type=date.fromisoformat, help="YYYY-AA-GG")
+    rebuild.add_argument("--to", dest="date_to", type=date.fromisoformat, help="YYYY-AA-GG")
+    args = parser.parse_args()
+
+    upgrade(engine)
+    db = SessionLocal()
+    try:
+        rebuild_sales_summary(db, args.date_from, args.date_to)
+        db.commit()
+    finally:
+        db.close()
+    print("Satış özetleri yeniden oluşturuldu.")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,10 +8,15 @@ from app.models.user import User, RoleEnum
 from app.models.customer import Customer
 from app.core.security import (
     create_access_token,
-    get_password_hash,
+    get_password_hash_async,
     authenticate_user,
+    get_current_user,
+    Principal,
     ACCESS_TOKEN_EXPIRE_MINUTES,
 )
+from app.core.pagination import count_cache
+from app.schemas.user import UserResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -32,7 +37,7 @@ class TokenResponse(BaseModel):
 # ---------------------- Kullanıcı Kayıt ----------------------
 
 @router.post("/register", response_model=TokenResponse)
-def register(
+async def register(
     username: str = Form(...),
     email: str = Form(...),
     password: str = Form(...),
@@ -43,9 +48,11 @@ def register(
     """
     Yeni kullanıcı oluşturur. Varsayılan rol "customer"dır.
     """
-    existing_user = db.query(User).filter(
-        (User.username == username) | (User.email == email)
-    ).first()
+    existing_user = await run_in_threadpool(
+        lambda: db.query(User).filter(
+            (User.username == username) | (User.email == email)
+        ).first()
+    )
     if existing_user:
         raise HTTPException(status_code=400, detail="Bu kullanıcı zaten mevcut.")
 
@@ -56,7 +63,8 @@ def register(
             detail="Customer rolü için 'customer_id' alanı gereklidir."
         )
 
-    hashed_pw = get_password_hash(password)
+    # bcrypt kendi havuzunda; istek threadpool'u meşgul edilmez
+    hashed_pw = await get_password_hash_async(password)
     user = User(
         username=username,
         email=email,
@@ -65,9 +73,12 @@ def register(
         customer_id=customer_id,
     )
 
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    def save():
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+    await run_in_threadpool(save)
+    count_cache.invalidate(User.__tablename__)
 
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     token = create_access_token(data={"sub": user.username}, expires_delta=access_token_expires)
@@ -77,11 +88,11 @@ def register(
 # ---------------------- Giriş (Login) ----------------------
 
 @router.post("/login", response_model=TokenResponse)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     """
     Kullanıcı girişi yapar ve JWT token döner.
     """
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -95,17 +106,9 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
 
 # ---------------------- Kullanıcı Bilgisi ----------------------
 
-from app.core.security import get_current_user  # dosyanın en üstüne ekle
-
-@router.get("/me", response_model=None)
-def get_me(current_user: User = Depends(get_current_user)):
+@router.get("/me", response_model=UserResponse)
+async def get_me(current_user: Principal = Depends(get_current_user)):
     """
     Aktif kullanıcının bilgilerini döner.
     """
-    return {
-        "id": current_user.id,
-        "username": current_user.username,
-        "email": current_user.email,
-        "role": current_user.role,
-        "customer_id": current_user.customer_id,
-    }
\ No newline at end of file
+    return current_user
\ No newline at end of file
@@ -1,10 +1,16 @@
 # -*- coding: utf-8 -*-
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, get_async_db
 from app.models.customer import Customer
-from app.models.user import User, RoleEnum
-from app.core.security import get_current_user, rep_required
+from app.models.user import RoleEnum
+from app.core.security import get_current_user, Principal, rep_required
+from app.core.pagination import PageParams, paginate_async, count_cache
+from app.core.search import search
+from app.schemas.customer import CustomerResponse, CustomerListItem
+from app.schemas.common import MessageResponse
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/customers", tags=["Customers"])
@@ -18,19 +24,45 @@ class CustomerCreate(BaseModel):
     phone: str | None = None
     default_discount: float | None = 0.0
 
+CUSTOMER_FIELDS = ("id", "name", "tax_number", "address", "phone", "default_discount")
+
 # ------------------- Routes -------------------
 
-@router.get("/")
-def list_customers(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+# Müşteri rolü kendi kaydını tek nesne olarak alır, diğerleri sayfalı liste
+@router.get("/", response_model=list[CustomerListItem] | CustomerResponse, response_model_exclude_unset=True)
+async def list_customers(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user),
+):
     """Admin ve temsilciler tüm müşterileri görebilir, müşteriler sadece kendi kayıtlarını görür"""
     if current_user.role == RoleEnum.customer:
         if not current_user.customer_id:
             raise HTTPException(status_code=404, detail="Müşteri kaydı bulunamadı.")
-        return db.query(Customer).filter(Customer.id == current_user.customer_id).first()
+        columns = [getattr(Customer, name) for name in CUSTOMER_FIELDS]
+        result = await db.execute(select(*columns).where(Customer.id == current_user.customer_id))
+        # Kullanıcıya bağlı müşteri kaydı silinmiş olabilir
+        customer = result.mappings().first()
+        if customer is None:
+            raise HTTPException(status_code=404, detail="Müşteri kaydı bulunamadı.")
+        return customer
+
+    return await paginate_async(db, Customer, page, request, response, CUSTOMER_FIELDS)
 
-    return db.query(Customer).all()
+@router.get("/search", response_model=list[CustomerResponse], dependencies=[Depends(rep_required)])
+def search_customers(
+    q: str = Query(..., min_length=1, description="Ad, vergi no veya adres (kelime başı yeterli)"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """Müşterileri ad / vergi no / adrese göre arar — sadece admin veya temsilci"""
+    columns = [getattr(Customer, name) for name in CUSTOMER_FIELDS]
+    return search(db, Customer, "customers_fts", columns, q, limit, offset)
 
-@router.post("/", dependencies=[Depends(rep_required)])
+@router.post("/", response_model=CustomerResponse, dependencies=[Depends(rep_required)])
 def create_customer(customer_data: CustomerCreate, db: Session = Depends(get_db)):
     new_customer = Customer(
         name=customer_data.name,
@@ -42,13 +74,15 @@ def create_customer(customer_data: CustomerCreate, db: Session = Depends(get_db)
     db.add(new_customer)
     db.commit()
     db.refresh(new_customer)
+    count_cache.invalidate(Customer.__tablename__)
     return new_customer
 
-@router.delete("/{customer_id}", dependencies=[Depends(rep_required)])
+@router.delete("/{customer_id}", response_model=MessageResponse, dependencies=[Depends(rep_required)])
 def delete_customer(customer_id: int, db: Session = Depends(get_db)):
     customer = db.query(Customer).filter(Customer.id == customer_id).first()
     if not customer:
         raise HTTPException(status_code=404, detail="Müşteri bulunamadı.")
     db.delete(customer)
     db.commit()
+    count_cache.invalidate(Customer.__tablename__)
     return {"message": "Müşteri başarıyla silindi."}
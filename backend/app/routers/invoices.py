@@ -1,48 +1,93 @@
 # -*- coding: utf-8 -*-
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from datetime import datetime
-from weasyprint import HTML, CSS
-import os
-from jinja2 import Template
-from fastapi.responses import FileResponse
+from datetime import datetime, date
+from fastapi.responses import Response, ORJSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from app.database import get_db
-from app.models.invoice import Invoice, InvoiceItem
+from app.models.invoice import Invoice, InvoiceItem, invoice_detail_query, invoice_filters
 from app.models.customer import Customer
-from app.models.product import Product
-from app.schemas.invoice import InvoiceCreate
-from app.models.user import User, RoleEnum
-from app.core.security import get_current_user, rep_required
+from app.models.pdf_job import PdfJob, PdfJobStatus
+from app.schemas.invoice import (
+    InvoiceCreate, InvoiceResponse, InvoiceListItem, PdfJobResponse,
+    InvoiceBatchCreate, InvoiceBatchResponse, InvoiceBatchResult,
+)
+from app.models.user import RoleEnum
+from app.core.security import get_current_user, Principal, rep_required
+from app.core.pdf import build_invoice_context, render_merged_pdf, pdf_etag
+from app.core.http_cache import etag_matches, not_modified
+from app.core.pdf_pool import generate_invoice_pdf_async, pdf_pool, RenderQueueFull, queue_full_error
+from app.core.pdf_export import select_invoice_ids, load_invoice_contexts, stream_invoice_zip
+from app.core.data_export import stream_invoices_csv, stream_invoices_ndjson
+from app.core.config import settings
+from app.core.pdf_jobs import enqueue_pdf_job, enqueue_pdf_jobs
+from app.core.invoice_numbers import allocate_invoice_numbers, format_fatura_no
+from app.core.pagination import PageParams, paginate, count_cache
+from app.core.sales_summary import record_invoice_sales
+from app.core.catalog import catalog
+from app.core.pricing import price_invoices
 
 router = APIRouter(prefix="/invoices", tags=["Invoices"])
 
+MAX_INVOICE_LINES = 25  # faturada en fazla satır
+
 
 # --------------------- Yardımcı Fonksiyonlar ---------------------
 
-def tl_format(x):
-    try:
-        return f"₺{float(x):,.2f}".replace(",", ".").replace(".", ",", 1)
-    except Exception:
-        return "₺0,00"
+def pdf_response(pdf_bytes: bytes, invoice_id: int, etag: str):
+    """PDF baytlarını doğrudan bellekten indirme yanıtı olarak döner"""
+    return Response(
+        content=pdf_bytes,
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f'attachment; filename="Fatura_{invoice_id}.pdf"',
+            "Content-Length": str(len(pdf_bytes)),
+            "ETag": etag,
+            # Tarayıcı saklayabilir ama her seferinde ETag ile doğrulamalı
+            "Cache-Control": "private, no-cache",
+        },
+    )
 
 
-def get_logo_path():
-    """Logo yolunu sistemden otomatik olarak çeker"""
-    static_path = os.path.join("app", "static", "ertan.png")
-    if os.path.exists(static_path):
-        return f"file:///{os.path.abspath(static_path).replace(os.sep, '/')}"
-    return None
+# --------------------- Fatura Oluşturma ---------------------
 
+PDF_RESPONSE = {"content": {"application/pdf": {}}, "description": "Fatura PDF'i"}
 
-# --------------------- Fatura Oluşturma ---------------------
 
-@router.post("/create")
-def create_invoice(
+@router.post(
+    "/create",
+    response_class=Response,
+    responses={200: PDF_RESPONSE, 202: {"model": InvoiceResponse, "description": "async_pdf=true"}},
+)
+async def create_invoice(
     invoice_data: InvoiceCreate,
+    async_pdf: bool = Query(False, description="PDF'i beklemeden fatura JSON'u dön, PDF'i kuyruğa al"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Yeni fatura oluşturur ve PDF olarak döner"""
+    # Veritabanı işi threadpool'da, PDF yerleşimi işçi süreçte yapılır
+    invoice, job = await run_in_threadpool(save_invoice, invoice_data, db, current_user, async_pdf)
+
+    if job is not None:
+        body = await run_in_threadpool(
+            lambda: InvoiceResponse.model_validate(invoice).model_dump(mode="json")
+        )
+        return ORJSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=body,
+            headers={"Location": f"/invoices/jobs/{job.id}"},
+        )
+
+    context = await run_in_threadpool(build_invoice_context, invoice, invoice.customer, invoice.items)
+    pdf_bytes = await generate_invoice_pdf_async(context)
+    return pdf_response(pdf_bytes, invoice.id, pdf_etag(context))
+
+
+def save_invoice(invoice_data: InvoiceCreate, db: Session, current_user: Principal, enqueue_pdf: bool = False):
+    """Faturayı hesaplayıp kaydeder; enqueue_pdf ise PDF işini aynı işlemde kuyruğa ekler"""
     if current_user.role not in [RoleEnum.admin, RoleEnum.representative]:
         raise HTTPException(status_code=403, detail="Fatura oluşturma yetkiniz yok.")
 
@@ -50,87 +95,337 @@ def create_invoice(
     if not customer:
         raise HTTPException(status_code=404, detail="Müşteri bulunamadı.")
 
-    # Fatura numarası otomatik üretim
-    last_invoice = db.query(Invoice).order_by(Invoice.id.desc()).first()
-    if last_invoice:
-        next_id = last_invoice.id + 1
-    else:
-        next_id = 1
-    fatura_no = f"FAT-{datetime.now().year}-{next_id:05d}"
-
-    # Hesap değişkenleri
-    subtotal = 0.0
-    total_discount = 0.0
-    total_vat = 0.0
-    items = []
-
-    for item_data in invoice_data.items[:25]:  # maksimum 25 satır
-        product = db.query(Product).filter(Product.id == item_data.product_id).first()
-        if not product:
-            continue
+    # Fiyatlar bellekteki katalogdan: ürün sorgusu yok
+    lines = invoice_data.items[:MAX_INVOICE_LINES]
+    snapshot = catalog.current(db)
 
-        # Ürün fiyatı alımı (unit_price zorunlu)
-        unit_price = float(product.unit_price or 0)
-        quantity = float(item_data.quantity or 0)
-        discount_rate = float(item_data.discount_rate or 0)
-        try:
-            vat_rate = float(product.vat_rate.value)
-        except Exception:
-            try:
-                vat_rate = float(product.vat_rate)
-            except Exception:
-                vat_rate = 0.0
-
-        raw_total = unit_price * quantity
-        discount_amount = raw_total * discount_rate / 100
-        vat_amount = (raw_total - discount_amount) * vat_rate / 100
-
-        subtotal += raw_total
-        total_discount += discount_amount
-        total_vat += vat_amount
-
-        item = InvoiceItem(
-            product_id=product.id,
-            quantity=quantity,
-            unit_price=unit_price,
-            discount_rate=discount_rate,
-            vat_rate=vat_rate,
-            line_total=raw_total - discount_amount + vat_amount
-        )
-        items.append(item)
+    priced = price_invoices([lines], snapshot.products)[0]
+    items = priced.item_rows()
 
-    grand_total = subtotal - total_discount + total_vat
+    # Fatura numarası: yıllık sayaçtan, kilidi kısa tutmak için en son adımda
+    now = datetime.now()
+    fatura_no = format_fatura_no(now.year, allocate_invoice_numbers(db, now.year)[0])
 
     # Fatura nesnesi
-    invoice = Invoice(
-        date=datetime.now(),
+    invoice_row = dict(
+        date=now,
         customer_id=customer.id,
         fatura_no=fatura_no,
-        subtotal=subtotal,
-        vat_total=total_vat,
-        discount_total=total_discount,
-        grand_total=grand_total,
-        items=items
+        catalog_version=snapshot.version,
+        **priced.totals(),
     )
+    invoice = Invoice(**invoice_row)
 
     db.add(invoice)
+    db.flush()
+    invoice_id = invoice.id
+
+    # Satırlar tek executemany ile (ORM'in satır satır INSERT'i yerine)
+    if items:
+        db.execute(insert(InvoiceItem), [dict(item, invoice_id=invoice_id) for item in items])
+    record_invoice_sales(db, [(invoice_row, priced.lines)])
+
+    job = None
+    if enqueue_pdf:
+        job = enqueue_pdf_job(db, invoice_id)
     db.commit()
-    db.refresh(invoice)
+    count_cache.invalidate(Invoice.__tablename__)
+
+    # Commit sonrası süresi dolan nesneleri tek sorguda, ilişkileriyle birlikte yenile
+    invoice = invoice_detail_query(db).filter(Invoice.id == invoice_id).one()
+    return invoice, job
+
+
+# --------------------- Toplu Fatura Oluşturma ---------------------
+
+@router.post("/batch", response_model=InvoiceBatchResponse)
+def create_invoice_batch(
+    batch: InvoiceBatchCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Dönem sonu faturalaması için çok sayıda faturayı tek istekte oluşturur.
+    Her fatura için ayrı başarı / hata bilgisi döner; PDF'ler isteğe bağlı
+    olarak arka plan kuyruğuna alınır.
+    """
+    if current_user.role not in [RoleEnum.admin, RoleEnum.representative]:
+        raise HTTPException(status_code=403, detail="Fatura oluşturma yetkiniz yok.")
+    if len(batch.invoices) > settings.invoice_batch_max:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Tek istekte en fazla {settings.invoice_batch_max} fatura gönderilebilir."
+        )
+
+    # Müşteriler tüm parti için tek sorguda; ürünler bellekteki katalogdan
+    customer_ids = {inv.customer_id for inv in batch.invoices}
+    known_customers = {cid for (cid,) in db.query(Customer.id).filter(Customer.id.in_(customer_ids))}
+    snapshot = catalog.current(db)
+    products = snapshot.products
+
+    results = [InvoiceBatchResult(index=i, success=False) for i in range(len(batch.invoices))]
+    pending = []  # (index, fatura satırı, PricedInvoice)
+
+    valid = []
+    for index, invoice_data in enumerate(batch.invoices):
+        error = validate_batch_invoice(invoice_data, known_customers, products)
+        if error:
+            results[index].error = error
+        else:
+            valid.append((index, invoice_data))
+
+    # Geçerli faturaların tüm satırları tek geçişte fiyatlanır
+    priced_invoices = price_invoices([invoice_data.items for _, invoice_data in valid], products)
+    for (index, invoice_data), priced in zip(valid, priced_invoices):
+        row = dict(
+            customer_id=invoice_data.customer_id,
+            catalog_version=snapshot.version,
+            **priced.totals(),
+        )
+        pending.append((index, row, priced))
+
+    # Parça parça yaz: her parça tek işlem, hata sadece o parçayı etkiler
+    chunk_size = max(1, settings.invoice_batch_chunk)
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start:start + chunk_size]
+        try:
+            created = insert_invoice_chunk(db, chunk, batch.enqueue_pdf)
+            db.commit()
+            count_cache.invalidate(Invoice.__tablename__)
+        except SQLAlchemyError as exc:
+            db.rollback()
+            for index, _, _ in chunk:
+                results[index].error = f"Veritabanı hatası: {exc.__class__.__name__}"
+            continue
+
+        for index, invoice_id, fatura_no, job_id in created:
+            results[index] = InvoiceBatchResult(
+                index=index, success=True, invoice_id=invoice_id,
+                fatura_no=fatura_no, job_id=job_id,
+            )
+
+    created_count = sum(1 for r in results if r.success)
+    return InvoiceBatchResponse(
+        created=created_count,
+        failed=len(results) - created_count,
+        results=results,
+    )
+
+
+def validate_batch_invoice(invoice_data: InvoiceCreate, known_customers, products):
+    """Toplu faturadaki tek kaydı doğrular; hata mesajı ya da None döner"""
+    if invoice_data.customer_id not in known_customers:
+        return "Müşteri bulunamadı."
+    if not invoice_data.items:
+        return "Fatura satırı yok."
+    if len(invoice_data.items) > MAX_INVOICE_LINES:
+        return f"Bir faturada en fazla {MAX_INVOICE_LINES} satır olabilir."
+    missing = sorted({item.product_id for item in invoice_data.items if item.product_id not in products})
+    if missing:
+        return f"Ürün bulunamadı: {', '.join(map(str, missing))}"
+    return None
+
+
+def insert_invoice_chunk(db: Session, chunk, enqueue_pdf: bool):
+    """
+    Bir parça faturayı toplu INSERT'lerle yazar, ardışık fatura numarası ayırır.
+    Dönüş: [(index, invoice_id, fatura_no, job_id)]
+    """
+    now = datetime.now()
+    numbers = allocate_invoice_numbers(db, now.year, len(chunk))
+
+    invoice_rows = [
+        dict(row, date=now, fatura_no=format_fatura_no(now.year, number))
+        for (_, row, _), number in zip(chunk, numbers)
+    ]
+    inserted = db.execute(insert(Invoice).returning(Invoice.id, Invoice.fatura_no), invoice_rows)
+    # RETURNING sırası garanti değil; benzersiz fatura_no ile eşleştir
+    ids_by_no = {fatura_no: invoice_id for invoice_id, fatura_no in inserted}
+    invoice_ids = [ids_by_no[row["fatura_no"]] for row in invoice_rows]
+
+    item_rows = [
+        dict(item, invoice_id=invoice_id)
+        for (_, _, priced), invoice_id in zip(chunk, invoice_ids)
+        for item in priced.item_rows()
+    ]
+    if item_rows:
+        db.execute(insert(InvoiceItem), item_rows)
+    record_invoice_sales(db, [(row, priced.lines) for row, (_, _, priced) in zip(invoice_rows, chunk)])
+
+    jobs = enqueue_pdf_jobs(db, invoice_ids) if enqueue_pdf else {}
+
+    return [
+        (index, invoice_id, row["fatura_no"], jobs.get(invoice_id))
+        for (index, _, _), invoice_id, row in zip(chunk, invoice_ids, invoice_rows)
+    ]
+
+
+# --------------------- Fatura Listeleme ---------------------
+
+def scope_customer_id(current_user: Principal, customer_id: int | None) -> int | None:
+    """Müşteri rolü yalnızca kendi faturalarını görür; başka müşteri istenirse 403"""
+    if current_user.role != RoleEnum.customer:
+        return customer_id
+    if not current_user.customer_id:
+        raise HTTPException(status_code=404, detail="Müşteri kaydı bulunamadı.")
+    if customer_id is not None and customer_id != current_user.customer_id:
+        raise HTTPException(status_code=403, detail="Bu faturalara erişim yetkiniz yok.")
+    return current_user.customer_id
+
+
+INVOICE_FIELDS = (
+    "id", "fatura_no", "date", "customer_id",
+    "subtotal", "discount_total", "vat_total", "grand_total",
+)
+
+
+@router.get("/", response_model=list[InvoiceListItem], response_model_exclude_unset=True)
+def list_invoices(
+    request: Request,
+    response: Response,
+    customer_id: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    min_total: float | None = None,
+    max_total: float | None = None,
+    fatura_no: str | None = Query(None, description="Fatura numarası öneki, örn. FAT-2025-"),
+    page: PageParams = Depends(),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Faturaları filtreleyip id sırasıyla sayfa sayfa listeler (PDF üretmez)"""
+    customer_id = scope_customer_id(current_user, customer_id)
+    key_parts = (customer_id, date_from, date_to, min_total, max_total, fatura_no)
+    filters = invoice_filters(*key_parts)
+    return paginate(db, Invoice, page, request, response, INVOICE_FIELDS, filters, key_parts)
+
 
-    pdf_path = generate_invoice_pdf(invoice, customer, items)
-    return FileResponse(pdf_path, media_type="application/pdf", filename=f"Fatura_{invoice.id}.pdf")
+# --------------------- Toplu PDF Dışa Aktarma ---------------------
+# Not: "/{invoice_id}/pdf" yolundan önce tanımlanmalı ("export" id sanılmasın)
+
+def resolve_export_ids(db: Session, current_user: Principal, customer_id, date_from, date_to):
+    """Yetkiye göre müşteri filtresini uygular, seçilen fatura id'lerini döner"""
+    customer_id = scope_customer_id(current_user, customer_id)
+    invoice_ids = select_invoice_ids(db, customer_id, date_from, date_to)
+    if not invoice_ids:
+        raise HTTPException(status_code=404, detail="Seçilen kriterlere uygun fatura bulunamadı.")
+    return invoice_ids
+
+
+MERGED_PDF_RESPONSE = {"content": {"application/pdf": {}}, "description": "Seçilen faturalar tek PDF'te"}
+ZIP_RESPONSE = {"content": {"application/zip": {}}, "description": "Her fatura ayrı PDF, ZIP akışı"}
+
+
+@router.get("/export/pdf", response_class=Response, responses={200: MERGED_PDF_RESPONSE})
+async def export_invoices_pdf(
+    customer_id: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Seçilen faturaları tek bir PDF belgesinde birleştirir"""
+    invoice_ids = await run_in_threadpool(resolve_export_ids, db, current_user, customer_id, date_from, date_to)
+    if len(invoice_ids) > settings.pdf_export_max_invoices:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Birleşik PDF en fazla {settings.pdf_export_max_invoices} fatura içerebilir; "
+                   f"daha fazlası için /invoices/export/zip kullanın."
+        )
+
+    contexts = await run_in_threadpool(load_invoice_contexts, invoice_ids)
+    try:
+        pdf_bytes = await pdf_pool.run(render_merged_pdf, contexts)
+    except RenderQueueFull:
+        raise queue_full_error()
+
+    return Response(
+        content=pdf_bytes,
+        media_type="application/pdf",
+        headers={"Content-Disposition": 'attachment; filename="Faturalar.pdf"'},
+    )
+
+
+@router.get("/export/zip", response_class=StreamingResponse, responses={200: ZIP_RESPONSE})
+async def export_invoices_zip(
+    customer_id: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Seçilen faturaları ayrı PDF'ler halinde, akış olarak ZIP içinde döner"""
+    invoice_ids = await run_in_threadpool(resolve_export_ids, db, current_user, customer_id, date_from, date_to)
+    return StreamingResponse(
+        stream_invoice_zip(invoice_ids),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="Faturalar.zip"'},
+    )
+
+
+# --------------------- Satır Bazlı Dışa Aktarma ---------------------
+# Fatura + kalem + ürün satırları; bellek kullanımı satır sayısından bağımsız
+
+CSV_RESPONSE = {"content": {"text/csv": {}}, "description": "Fatura kalemleri, CSV akışı"}
+NDJSON_RESPONSE = {"content": {"application/x-ndjson": {}}, "description": "Satır başına bir JSON nesnesi"}
+
+
+@router.get("/export/csv", response_class=StreamingResponse, responses={200: CSV_RESPONSE})
+def export_invoices_csv(
+    customer_id: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    current_user: Principal = Depends(get_current_user)
+):
+    """Fatura kalemlerini CSV olarak akıtır (mutabakat için)"""
+    filters = invoice_filters(scope_customer_id(current_user, customer_id), date_from, date_to)
+    return StreamingResponse(
+        stream_invoices_csv(filters),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": 'attachment; filename="Faturalar.csv"'},
+    )
+
+
+@router.get("/export/ndjson", response_class=StreamingResponse, responses={200: NDJSON_RESPONSE})
+def export_invoices_ndjson(
+    customer_id: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    current_user: Principal = Depends(get_current_user)
+):
+    """Fatura kalemlerini satır başına bir JSON nesnesi olarak akıtır"""
+    filters = invoice_filters(scope_customer_id(current_user, customer_id), date_from, date_to)
+    return StreamingResponse(
+        stream_invoices_ndjson(filters),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="Faturalar.ndjson"'},
+    )
 
 
 # --------------------- Fatura PDF Alma ---------------------
 
-@router.get("/{invoice_id}/pdf")
-def get_invoice_pdf(
+@router.get("/{invoice_id}/pdf", response_class=Response, responses={200: PDF_RESPONSE})
+async def get_invoice_pdf(
     invoice_id: int,
+    request: Request,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Var olan faturayı PDF olarak indirir"""
-    invoice = db.query(Invoice).filter(Invoice.id == invoice_id).first()
+    context = await run_in_threadpool(load_invoice_context, invoice_id, db, current_user)
+
+    # İstemcideki kopya güncelse PDF'e hiç dokunmadan 304
+    etag = pdf_etag(context)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+
+    pdf_bytes = await generate_invoice_pdf_async(context)
+    return pdf_response(pdf_bytes, invoice_id, etag)
+
+
+def load_invoice_context(invoice_id: int, db: Session, current_user: Principal):
+    """Faturayı yetki kontrolüyle okur, PDF şablonu için veriyi döner"""
+    invoice = invoice_detail_query(db).filter(Invoice.id == invoice_id).first()
     if not invoice:
         raise HTTPException(status_code=404, detail="Fatura bulunamadı.")
 
@@ -138,191 +433,26 @@ def get_invoice_pdf(
     if current_user.role == RoleEnum.customer and current_user.customer_id != invoice.customer_id:
         raise HTTPException(status_code=403, detail="Bu faturaya erişim yetkiniz yok.")
 
-    customer = db.query(Customer).filter(Customer.id == invoice.customer_id).first()
-    items = db.query(InvoiceItem).filter(InvoiceItem.invoice_id == invoice_id).all()
-
-    pdf_path = generate_invoice_pdf(invoice, customer, items)
-    return FileResponse(pdf_path, media_type="application/pdf", filename=f"Fatura_{invoice_id}.pdf")
-
-
-# --------------------- PDF Oluşturucu ---------------------
-
-def generate_invoice_pdf(invoice, customer, items):
-    """HTML + CSS tabanlı PDF çıktısı üretir"""
-    logo_path = get_logo_path()
-
-    html_template = Template("""
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <style>
-            body {
-                font-family: DejaVu Sans, sans-serif;
-                font-size: 11px;
-                margin: 20px 25px;
-                color: #222;
-            }
-            .header {
-                display: flex;
-                justify-content: space-between;
-                align-items: flex-start;
-                margin-bottom: 15px;
-            }
-            .header img { width: 120px; }
-            .invoice-info {
-                text-align: right;
-                border: 1px solid #999;
-                padding: 6px 10px;
-                border-radius: 4px;
-                background: #f9f9f9;
-                font-size: 10px;
-            }
-            .customer {
-                margin-top: 5px;
-                line-height: 1.4;
-                font-size: 10.5px;
-            }
-            h1 {
-                text-align: center;
-                color: #7a1c1c;
-                margin: 8px 0;
-                font-size: 15px;
-                text-transform: uppercase;
-            }
-            table {
-                width: 100%;
-                border-collapse: collapse;
-                margin-top: 8px;
-            }
-            th, td {
-                border: 1px solid #ccc;
-                padding: 5px;
-                text-align: center;
-                font-size: 10.5px;
-                word-wrap: break-word;
-            }
-            th {
-                background: #7a1c1c;
-                color: white;
-            }
-            tr:nth-child(even) { background: #f9f9f9; }
-
-            th:nth-child(1), td:nth-child(1) { width: 10%; }
-            th:nth-child(2), td:nth-child(2) { width: 43%; text-align: left; padding-left: 6px; }
-            th:nth-child(3), td:nth-child(3) { width: 8%; }
-            th:nth-child(4), td:nth-child(4) { width: 10%; }
-            th:nth-child(5), td:nth-child(5) { width: 8%; }
-            th:nth-child(6), td:nth-child(6) { width: 7%; }
-            th:nth-child(7), td:nth-child(7) { width: 14%; }
-
-            .totals {
-                margin-top: 18px;
-                width: 38%;
-                float: right;
-                font-size: 11px;
-            }
-            .totals td {
-                border: none;
-                padding: 3px 0;
-                text-align: right;
-            }
-            .sign {
-                width: 100%;
-                margin-top: 100px;
-                text-align: center;
-                position: absolute;
-                bottom: 75px;
-            }
-            .sign td {
-                width: 50%;
-                padding-top: 25px;
-                font-size: 11px;
-            }
-            .footer {
-                position: absolute;
-                bottom: 15px;
-                width: 100%;
-                text-align: center;
-                font-size: 9px;
-                color: gray;
-            }
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <div>
-                {% if logo_path %}
-                <img src="{{ logo_path }}" alt="Logo"><br>
-                {% endif %}
-                <div class="customer">
-                    <b>{{ customer.name }}</b><br>
-                    Vergi No: {{ customer.tax_number or '-' }}<br>
-                    {{ customer.address or '' }}
-                </div>
-            </div>
-            <div class="invoice-info">
-                <b>Fatura No:</b> {{ invoice.fatura_no }}<br>
-                <b>Tarih:</b> {{ invoice.date.strftime('%d.%m.%Y %H:%M') }}
-            </div>
-        </div>
-
-        <h1>Satış Faturası</h1>
-
-        <table>
-            <tr>
-                <th>Barkod</th>
-                <th>Ürün Adı</th>
-                <th>Miktar</th>
-                <th>Birim Fiyat</th>
-                <th>İskonto (%)</th>
-                <th>KDV (%)</th>
-                <th>Tutar</th>
-            </tr>
-            {% for item in items %}
-            <tr>
-                <td>{{ item.product.barcode or '-' }}</td>
-                <td>{{ item.product.name }}</td>
-                <td>{{ item.quantity }}</td>
-                <td>{{ tl_format(item.unit_price) }}</td>
-                <td>{{ item.discount_rate or 0 }}</td>
-                <td>{{ item.vat_rate or 0 }}</td>
-                <td>{{ tl_format(item.line_total) }}</td>
-            </tr>
-            {% endfor %}
-        </table>
-
-        <table class="totals">
-            <tr><td>Ara Toplam:</td><td>{{ tl_format(invoice.subtotal) }}</td></tr>
-            <tr><td>İskonto:</td><td>-{{ tl_format(invoice.discount_total) }}</td></tr>
-            <tr><td>KDV:</td><td>{{ tl_format(invoice.vat_total) }}</td></tr>
-            <tr><td><b>Genel Toplam:</b></td><td><b>{{ tl_format(invoice.grand_total) }}</b></td></tr>
-        </table>
-
-        <table class="sign">
-            <tr>
-                <td>_________________________<br><b>Teslim Eden</b></td>
-                <td>_________________________<br><b>Teslim Alan</b></td>
-            </tr>
-        </table>
-
-        <div class="footer">
-            Bu belge MFP tarafından otomatik oluşturulmuştur.
-        </div>
-    </body>
-    </html>
-    """)
-
-    rendered_html = html_template.render(
-        logo_path=logo_path,
-        invoice=invoice,
-        customer=customer,
-        items=items,
-        tl_format=tl_format,
-    )
+    return build_invoice_context(invoice, invoice.customer, invoice.items)
 
-    output_path = os.path.join("app", f"Fatura_{invoice.id}.pdf")
-    HTML(string=rendered_html).write_pdf(
-        output_path,
-        stylesheets=[CSS(string="body { font-family: DejaVu Sans; }")]
-    )
-    return output_path
+
+# --------------------- PDF İş Durumu ---------------------
+
+@router.get("/jobs/{job_id}", response_model=PdfJobResponse)
+def get_pdf_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Arka plandaki PDF işinin durumunu döner; hazırsa indirme adresini verir"""
+    job = db.query(PdfJob).filter(PdfJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="PDF işi bulunamadı.")
+
+    if current_user.role == RoleEnum.customer and current_user.customer_id != job.invoice.customer_id:
+        raise HTTPException(status_code=403, detail="Bu faturaya erişim yetkiniz yok.")
+
+    response = PdfJobResponse.model_validate(job)
+    if job.status == PdfJobStatus.done:
+        response.pdf_url = f"/invoices/{job.invoice_id}/pdf"
+    return response
@@ -1,10 +1,21 @@
 # -*- coding: utf-8 -*-
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from app.database import get_db
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, get_async_db
 from app.models.product import Product, VatRateEnum
 from app.models.user import User, RoleEnum
 from app.core.security import get_current_user, rep_required
+from app.core.pagination import PageParams, paginate_async, count_cache
+from app.core.search import search
+from app.core.barcodes import barcode_cache, combined_etag
+from app.core.catalog import catalog, bump_catalog_version
+from app.core.http_cache import etag_matches, not_modified
+from app.core.config import settings
+from app.schemas.product import ProductResponse, ProductListItem, BarcodeLookupResponse
+from app.schemas.common import MessageResponse
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/products", tags=["Products"])
@@ -17,14 +28,66 @@ class ProductCreate(BaseModel):
     price: float
     vat_rate: VatRateEnum = VatRateEnum.standard  # 💡 Enum yapısına göre
 
+class BarcodeBatch(BaseModel):
+    barcodes: list[str]
+
+PRODUCT_FIELDS = ("id", "name", "barcode", "unit_price", "vat_rate")
+
 # ------------------- Routes -------------------
 
-@router.get("/")
-def list_products(db: Session = Depends(get_db)):
-    """Tüm ürünleri listeler"""
-    return db.query(Product).all()
+@router.get("/", response_model=list[ProductListItem], response_model_exclude_unset=True)
+async def list_products(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Ürünleri id sırasıyla sayfa sayfa listeler (sonraki sayfa: X-Next-Cursor)"""
+    return await paginate_async(db, Product, page, request, response, PRODUCT_FIELDS)
+
+@router.get("/search", response_model=list[ProductResponse])
+def search_products(
+    q: str = Query(..., min_length=1, description="Ad veya barkod (kelime başı yeterli)"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """Ürünleri ad / barkoda göre arar, en alakalı sonuç önce"""
+    columns = [getattr(Product, name) for name in PRODUCT_FIELDS]
+    return search(db, Product, "products_fts", columns, q, limit, offset)
+
+@router.get("/barcode/{barcode}", response_model=ProductResponse)
+async def get_product_by_barcode(barcode: str, request: Request):
+    """Barkod okutma: ürünü süreç içi önbellekten döner (veritabanına gitmez)"""
+    if not barcode_cache.fresh:
+        await run_in_threadpool(barcode_cache.refresh)
+    entry = barcode_cache.get(barcode)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Bu barkoda ait ürün bulunamadı.")
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return not_modified(entry.etag)
+    return Response(content=entry.body, media_type="application/json", headers={"ETag": entry.etag})
+
+@router.post("/barcodes", response_model=BarcodeLookupResponse)
+async def get_products_by_barcodes(batch: BarcodeBatch):
+    """Çok sayıda barkodu tek istekte çözer; bulunamayanlar "missing" listesinde"""
+    if len(batch.barcodes) > settings.barcode_batch_max:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Tek istekte en fazla {settings.barcode_batch_max} barkod sorgulanabilir."
+        )
+    if not barcode_cache.fresh:
+        await run_in_threadpool(barcode_cache.refresh)
+    entries = [barcode_cache.get(barcode) for barcode in batch.barcodes]
+    return ORJSONResponse(
+        content={
+            "found": {e.product["barcode"]: e.product for e in entries if e is not None},
+            "missing": [b for b, e in zip(batch.barcodes, entries) if e is None],
+        },
+        headers={"ETag": combined_etag(entries)},
+    )
 
-@router.post("/", dependencies=[Depends(rep_required)])
+@router.post("/", response_model=ProductResponse, dependencies=[Depends(rep_required)])
 def create_product(product_data: ProductCreate, db: Session = Depends(get_db)):
     """Yeni ürün ekler — sadece admin veya temsilci erişebilir"""
     existing = db.query(Product).filter(Product.name == product_data.name).first()
@@ -38,16 +101,24 @@ def create_product(product_data: ProductCreate, db: Session = Depends(get_db)):
         vat_rate=product_data.vat_rate
     )
     db.add(product)
+    bump_catalog_version(db)
     db.commit()
     db.refresh(product)
+    count_cache.invalidate(Product.__tablename__)
+    barcode_cache.invalidate()
+    catalog.invalidate()
     return product
 
-@router.delete("/{product_id}", dependencies=[Depends(rep_required)])
+@router.delete("/{product_id}", response_model=MessageResponse, dependencies=[Depends(rep_required)])
 def delete_product(product_id: int, db: Session = Depends(get_db)):
     """Ürün siler — sadece admin veya temsilci erişebilir"""
     product = db.query(Product).filter(Product.id == product_id).first()
     if not product:
         raise HTTPException(status_code=404, detail="Ürün bulunamadı.")
     db.delete(product)
+    bump_catalog_version(db)
     db.commit()
+    count_cache.invalidate(Product.__tablename__)
+    barcode_cache.invalidate()
+    catalog.invalidate()
     return {"message": "Ürün silindi."}
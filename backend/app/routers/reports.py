@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+from datetime import date
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.core.security import viewer_or_higher
+from app.core.sales_summary import sales_by_day, sales_by_month, sales_by_customer, sales_by_product
+from app.schemas.report import SalesPeriodTotals, SalesCustomerTotals, SalesProductTotals
+
+# Tüm raporlar özet tablolardan (sales_daily_*) okunur; faturalar taranmaz
+router = APIRouter(prefix="/reports", tags=["Reports"], dependencies=[Depends(viewer_or_higher)])
+
+
+def check_range(date_from: date | None, date_to: date | None):
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="Başlangıç tarihi bitiş tarihinden sonra olamaz.")
+
+
+# ------------------- Routes -------------------
+
+@router.get("/daily", response_model=List[SalesPeriodTotals])
+def daily_sales(
+    date_from: date | None = None,
+    date_to: date | None = None,
+    customer_id: int | None = None,
+    db: Session = Depends(get_db),
+):
+    """Günlük ciro, iskonto ve KDV toplamları"""
+    check_range(date_from, date_to)
+    return sales_by_day(db, date_from, date_to, customer_id)
+
+
+@router.get("/monthly", response_model=List[SalesPeriodTotals])
+def monthly_sales(
+    date_from: date | None = None,
+    date_to: date | None = None,
+    customer_id: int | None = None,
+    db: Session = Depends(get_db),
+):
+    """Aylık ciro, iskonto ve KDV toplamları"""
+    check_range(date_from, date_to)
+    return sales_by_month(db, date_from, date_to, customer_id)
+
+
+@router.get("/customers", response_model=List[SalesCustomerTotals])
+def customer_sales(
+    date_from: date | None = None,
+    date_to: date | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    """Müşteri bazında toplamlar (en yüksek ciro önce)"""
+    check_range(date_from, date_to)
+    return sales_by_customer(db, date_from, date_to, limit)
+
+
+@router.get("/products", response_model=List[SalesProductTotals])
+def product_sales(
+    date_from: date | None = None,
+    date_to: date | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    """Ürün bazında satış toplamları (en yüksek ciro önce)"""
+    check_range(date_from, date_to)
+    return sales_by_product(db, date_from, date_to, limit)
@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.user import User, RoleEnum
 from app.core.security import get_current_user, admin_required
+from app.core.pagination import PageParams, paginate
+from app.schemas.user import UserResponse, UserListItem
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/users", tags=["Users"])
@@ -16,23 +18,23 @@ class UserCreate(BaseModel):
     password: str
     role: RoleEnum = RoleEnum.customer
 
+# password_hash bilinçli olarak dışarıda
+USER_FIELDS = ("id", "username", "email", "role", "customer_id")
+
 # ------------------- Routes -------------------
 
-@router.get("/", dependencies=[Depends(admin_required)])
-def list_users(db: Session = Depends(get_db)):
-    users = db.query(User).all()
-    return [
-        {
-            "id": u.id,
-            "username": u.username,
-            "email": u.email,
-            "role": u.role,
-            "customer_id": u.customer_id,
-        }
-        for u in users
-    ]
+@router.get("/", response_model=list[UserListItem], response_model_exclude_unset=True,
+            dependencies=[Depends(admin_required)])
+def list_users(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_db),
+):
+    return paginate(db, User, page, request, response, USER_FIELDS)
 
-@router.get("/{user_id}", dependencies=[Depends(admin_required)])
+# response_model: ORM nesnesindeki password_hash yanıta girmez
+@router.get("/{user_id}", response_model=UserResponse, dependencies=[Depends(admin_required)])
 def get_user(user_id: int, db: Session = Depends(get_db)):
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
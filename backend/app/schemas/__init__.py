@@ -1,3 +1,8 @@
-from .product import ProductCreate, ProductResponse
-from .customer import CustomerCreate, CustomerResponse
-from .invoice import InvoiceCreate, InvoiceResponse
+from .common import MessageResponse
+from .product import ProductCreate, ProductResponse, ProductListItem, BarcodeLookupResponse
+from .customer import CustomerCreate, CustomerResponse, CustomerListItem
+from .user import UserCreate, UserResponse, UserListItem
+from .invoice import (
+    InvoiceCreate, InvoiceResponse, InvoiceListItem, PdfJobResponse,
+    InvoiceBatchCreate, InvoiceBatchResponse,
+)
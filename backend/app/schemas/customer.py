@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
 class CustomerCreate(BaseModel):
@@ -14,7 +14,15 @@ class CustomerResponse(BaseModel):
     tax_number: Optional[str] = None
     address: Optional[str] = None
     phone: Optional[str] = None
-    default_discount: float
+    default_discount: Optional[float] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+class CustomerListItem(BaseModel):
+    """Sayfalı liste satırı: fields= ile seçilmeyen alanlar yanıtta yer almaz"""
+    id: int
+    name: Optional[str] = None
+    tax_number: Optional[str] = None
+    address: Optional[str] = None
+    phone: Optional[str] = None
+    default_discount: Optional[float] = None
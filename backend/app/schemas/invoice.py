@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
 from datetime import datetime
 
@@ -16,6 +16,26 @@ class InvoiceCreate(BaseModel):
     items: List[InvoiceItemCreate]
 
 
+class InvoiceBatchCreate(BaseModel):
+    invoices: List[InvoiceCreate]
+    enqueue_pdf: bool = False  # PDF'ler arka plan kuyruğuna alınsın mı
+
+
+class InvoiceBatchResult(BaseModel):
+    index: int                         # istekteki sıra
+    success: bool
+    invoice_id: Optional[int] = None
+    fatura_no: Optional[str] = None
+    job_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class InvoiceBatchResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[InvoiceBatchResult]
+
+
 class InvoiceItemResponse(BaseModel):
     id: int
     product_id: int
@@ -25,8 +45,7 @@ class InvoiceItemResponse(BaseModel):
     vat_rate: float
     line_total: float
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class InvoiceResponse(BaseModel):
@@ -37,7 +56,32 @@ class InvoiceResponse(BaseModel):
     vat_total: float
     discount_total: float
     grand_total: float
+    catalog_version: Optional[int] = None
     items: List[InvoiceItemResponse]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class InvoiceListItem(BaseModel):
+    """Sayfalı liste satırı: fields= ile seçilmeyen alanlar yanıtta yer almaz"""
+    id: int
+    fatura_no: Optional[str] = None
+    date: Optional[datetime] = None
+    customer_id: Optional[int] = None
+    subtotal: Optional[float] = None
+    discount_total: Optional[float] = None
+    vat_total: Optional[float] = None
+    grand_total: Optional[float] = None
+
+
+class PdfJobResponse(BaseModel):
+    id: int
+    invoice_id: int
+    status: str
+    attempts: int
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    pdf_url: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,14 +1,6 @@
-from pydantic import BaseModel
-from enum import Enum
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
-
-class VatRateEnum(float, Enum):
-    zero = 0.0
-    low = 5.0
-    medium = 10.0
-    reduced = 16.0
-    standard = 20.0
-    special = -1.0
+from app.models.product import VatRateEnum
 
 class ProductBase(BaseModel):
     name: str
@@ -22,5 +14,16 @@ class ProductCreate(ProductBase):
 class ProductResponse(ProductBase):
     id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class ProductListItem(BaseModel):
+    """Sayfalı liste satırı: fields= ile seçilmeyen alanlar yanıtta yer almaz"""
+    id: int
+    name: Optional[str] = None
+    barcode: Optional[str] = None
+    unit_price: Optional[float] = None
+    vat_rate: Optional[VatRateEnum] = None
+
+class BarcodeLookupResponse(BaseModel):
+    found: dict[str, ProductResponse]
+    missing: list[str]
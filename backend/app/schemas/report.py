@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+from pydantic import BaseModel
+from typing import Optional
+
+
+class SalesPeriodTotals(BaseModel):
+    period: str               # "YYYY-MM-DD" (günlük) veya "YYYY-MM" (aylık)
+    invoice_count: int
+    subtotal: float
+    discount_total: float
+    vat_total: float
+    grand_total: float
+
+
+class SalesCustomerTotals(BaseModel):
+    customer_id: int
+    customer_name: Optional[str] = None
+    invoice_count: int
+    subtotal: float
+    discount_total: float
+    vat_total: float
+    grand_total: float
+
+
+class SalesProductTotals(BaseModel):
+    product_id: int
+    product_name: Optional[str] = None
+    barcode: Optional[str] = None
+    line_count: int
+    quantity: float
+    subtotal: float
+    discount_total: float
+    vat_total: float
+    line_total: float
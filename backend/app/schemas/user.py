@@ -1,22 +1,26 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
-from enum import Enum
-
-class RoleEnum(str, Enum):
-    admin = "admin"
-    customer = "customer"
-    representative = "representative"
-    viewer = "viewer"
+from app.models.user import RoleEnum
 
 class UserBase(BaseModel):
     username: str
     email: str
-    role: Optional[RoleEnum] = "customer"
+    role: Optional[RoleEnum] = RoleEnum.customer
 
 class UserCreate(UserBase):
     password: str
 
 class UserResponse(UserBase):
+    """password_hash bilinçli olarak yok"""
+    id: int
+    customer_id: Optional[int] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class UserListItem(BaseModel):
+    """Sayfalı liste satırı: fields= ile seçilmeyen alanlar yanıtta yer almaz"""
     id: int
-    class Config:
-        from_attributes = True
+    username: Optional[str] = None
+    email: Optional[str] = None
+    role: Optional[RoleEnum] = None
+    customer_id: Optional[int] = None
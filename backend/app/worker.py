@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""
+Arka plan PDF işçisi.
+
+Kullanım:
+    python -m app.worker          # kuyruğu sürekli dinler
+    python -m app.worker --once   # bekleyen işleri bitirip çıkar
+
+İşçi, PDF'leri web süreçleriyle paylaşılan disk önbelleğine (MFP_PDF_CACHE_DIR)
+yazar; /invoices/{id}/pdf isteği bu dosyayı yerleşim yapmadan döner.
+Şema açılışta oluşturulmaz: önce python -m app.migrate çalıştırılmalıdır.
+"""
+import argparse
+import logging
+from app.core.pdf_jobs import run_worker
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MFP PDF işçisi")
+    parser.add_argument("--once", action="store_true", help="Kuyruk boşalınca çık")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    run_worker(once=args.once)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+"""
+API sıcak yolları için tekrarlanabilir ölçüm (benchmark) ve yük testi.
+
+Kullanım (backend klasöründen):
+    python -m bench seed --customers 1000 --products 5000 --invoices 20000
+    python -m bench run --out sonuc.json                      # aynı süreçte (TestClient)
+    python -m bench run --mode uvicorn --workers 4 --concurrency 16 --out sonuc.json
+    python -m bench startup --out acilis.json                  # import app.main süresi
+    python -m bench serialize --rows 1000                      # liste yanıtı serileştirme
+    python -m bench compare temel.json sonuc.json              # gerileme varsa çıkış kodu 1
+
+Ölçüm verisi bench/data altında ayrı bir SQLite veritabanındadır; uygulamanın
+kendi veritabanına dokunulmaz.
+"""
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""python -m bench {seed,run,compare} — ayrıntılar için bench/__init__.py"""
+import argparse
+import json
+import os
+import sys
+from bench.environment import DEFAULT_WORKDIR, configure_environment, database_path, git_commit
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m bench", description="MFP API ölçümleri")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed = commands.add_parser("seed", help="Ölçüm veritabanını sentetik veriyle oluştur")
+    run = commands.add_parser("run", help="Senaryoları çalıştır, sonucu JSON yaz")
+    for sub in (seed, run):
+        sub.add_argument("--workdir", default=DEFAULT_WORKDIR, help="Veritabanı ve PDF önbelleği klasörü")
+        sub.add_argument("--customers", type=int, default=1000)
+        sub.add_argument("--products", type=int, default=5000)
+        sub.add_argument("--invoices", type=int, default=20000)
+        sub.add_argument("--lines", type=int, default=5, help="Faturada en fazla satır")
+        sub.add_argument("--seed", type=int, default=42)
+        sub.add_argument("--reseed", action="store_true", help="Var olan ölçüm veritabanını sil")
+
+    run.add_argument("--mode", choices=("inprocess", "uvicorn"), default="inprocess")
+    run.add_argument("--workers", type=int, default=4, help="uvicorn işçi süreci sayısı")
+    run.add_argument("--port", type=int, default=8765)
+    run.add_argument("--scenarios", default=None, help="Virgülle ayrılmış; varsayılan hepsi")
+    run.add_argument("--requests", type=int, default=200, help="Senaryo başına ölçülen istek")
+    run.add_argument("--warmup", type=int, default=10)
+    run.add_argument("--concurrency", type=int, default=1)
+    run.add_argument("--out", default=None, help="Sonuç JSON dosyası (yoksa ekrana)")
+
+    startup = commands.add_parser("startup", help="import app.main süresini ölç")
+    startup.add_argument("--runs", type=int, default=7)
+    startup.add_argument("--budget-ms", type=float, default=None, help="Medyan bu süreyi aşarsa çıkış kodu 1")
+    startup.add_argument("--out", default=None, help="Sonuç JSON dosyası (yoksa ekrana)")
+
+    serialize = commands.add_parser("serialize", help="Liste yanıtı serileştirme: encoder ve response_model + orjson")
+    serialize.add_argument("--rows", type=int, default=1000)
+    serialize.add_argument("--runs", type=int, default=20)
+    serialize.add_argument("--out", default=None, help="Sonuç JSON dosyası (yoksa ekrana)")
+
+    compare = commands.add_parser("compare", help="İki sonucu karşılaştır; gerileme varsa çıkış kodu 1")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--tolerance", type=float, default=0.15, help="İzin verilen oran (0.15 = %%15)")
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        sys.exit(run_compare(args))
+    if args.command == "startup":
+        sys.exit(run_startup(args))
+    if args.command == "serialize":
+        run_serialize(args)
+        return
+
+    # Uygulama modülleri ayarları içe aktarılırken okur: önce ortam
+    configure_environment(args.workdir)
+    sizes = prepare_database(args)
+    if args.command == "run":
+        run_benchmarks(args, sizes)
+    else:
+        print(f"Ölçüm veritabanı hazır: {sizes}")
+
+
+def prepare_database(args) -> dict:
+    """Veritabanı yoksa (veya --reseed) tohumlar; kayıtlı boyutları döner"""
+    path = database_path(args.workdir)
+    sizes_path = os.path.join(args.workdir, "sizes.json")
+    if args.reseed:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    if os.path.exists(path) and os.path.exists(sizes_path):
+        with open(sizes_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    from bench.seed import seed_database
+    print(f"Tohumlanıyor: {args.customers} müşteri, {args.products} ürün, {args.invoices} fatura")
+    sizes = seed_database(args.customers, args.products, args.invoices, args.lines, args.seed)
+    with open(sizes_path, "w", encoding="utf-8") as f:
+        json.dump(sizes, f)
+    return sizes
+
+
+def run_benchmarks(args, sizes: dict):
+    from bench.drivers import InProcessDriver, UvicornDriver
+    from bench.runner import login_all, run_scenario, run_meta
+    from bench.scenarios import SCENARIOS, BenchContext
+
+    names = [name.strip() for name in args.scenarios.split(",")] if args.scenarios else list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        sys.exit(f"Bilinmeyen senaryo: {', '.join(unknown)} (seçenekler: {', '.join(SCENARIOS)})")
+
+    driver = InProcessDriver() if args.mode == "inprocess" else UvicornDriver(args.workers, args.port)
+    with driver:
+        ctx = BenchContext(sizes, login_all(driver))
+        results = dict(meta=run_meta(driver, sizes, args), scenarios={})
+        for name in names:
+            summary = run_scenario(
+                driver, SCENARIOS[name], ctx, args.requests, args.concurrency, args.warmup, args.seed
+            )
+            results["scenarios"][name] = summary
+            print(
+                f"{name:15} p50 {summary['p50_ms']:8.1f} ms  p95 {summary['p95_ms']:8.1f} ms  "
+                f"p99 {summary['p99_ms']:8.1f} ms  {summary['throughput_rps']:8.1f} istek/sn  "
+                f"SQL {summary['sql_per_request']}  hata {summary['errors']}"
+            )
+
+    write_results(results, args.out)
+
+
+def run_startup(args) -> int:
+    from bench.startup import measure_startup
+
+    summary = measure_startup(args.runs)
+    print(
+        f"import app.main: medyan {summary['median_ms']:.1f} ms "
+        f"(en düşük {summary['min_ms']:.1f}, en yüksek {summary['max_ms']:.1f})"
+    )
+    for item in summary["top_imports"]:
+        print(f"  {item['cumulative_ms']:8.1f} ms  {item['module']}")
+    write_results(dict(meta=dict(commit=git_commit()), startup=summary), args.out)
+
+    failed = False
+    if summary["lazy_modules_loaded"]:
+        print(f"Açılışta yüklenmemesi gereken paketler: {', '.join(summary['lazy_modules_loaded'])}")
+        failed = True
+    if args.budget_ms is not None and summary["median_ms"] > args.budget_ms:
+        print(f"Bütçe aşıldı: {summary['median_ms']:.1f} ms > {args.budget_ms:.1f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+def run_serialize(args):
+    from bench.serialization import measure_serialization
+
+    results = measure_serialization(args.rows, args.runs)
+    for name, item in results.items():
+        print(
+            f"{name:13} {item['rows']} satır: encoder {item['encoder_ms']:8.2f} ms "
+            f"({item['encoder_peak_kib']:.0f} KiB), response_model + orjson {item['model_ms']:8.2f} ms "
+            f"({item['model_peak_kib']:.0f} KiB) → {item['speedup']}x"
+        )
+    write_results(dict(meta=dict(commit=git_commit()), serialization=results), args.out)
+
+
+def write_results(results: dict, path: str | None):
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+def run_compare(args) -> int:
+    from bench.compare import compare_results
+    from bench.startup import compare_startup
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+
+    lines, regressions = [], []
+    if "scenarios" in baseline and "scenarios" in current:
+        lines, regressions = compare_results(baseline, current, args.tolerance)
+    if "startup" in baseline and "startup" in current:
+        startup_lines, startup_regressions = compare_startup(
+            baseline["startup"], current["startup"], args.tolerance
+        )
+        lines += startup_lines
+        regressions += startup_regressions
+    if "serialization" in baseline and "serialization" in current:
+        from bench.serialization import compare_serialization
+        serialization_lines, serialization_regressions = compare_serialization(
+            baseline["serialization"], current["serialization"], args.tolerance
+        )
+        lines += serialization_lines
+        regressions += serialization_regressions
+    print("\n".join(lines))
+    if regressions:
+        print("\nGerileme:")
+        print("\n".join(f"  - {item}" for item in regressions))
+        return 1
+    print("\nGerileme yok.")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+İki ölçüm sonucunu karşılaştırır.
+
+Gerileme sayılanlar:
+  - p50 veya p95 gecikmesi tolerans oranından fazla arttıysa,
+  - işlem hacmi (istek/sn) tolerans oranından fazla düştüyse,
+  - hata sayısı arttıysa,
+  - istek başına SQL ifadesi sayısı SQL_SLACK'ten fazla arttıysa (sorgu bütçesi).
+    Küçük pay, işçi süreçlerin ilk isteklerindeki tek seferlik yüklemeler içindir;
+    eklenen her sorgu istek başına en az 1 artış demektir.
+p99 ve max raporlanır ama kısa koşularda gürültülü olduğundan gerileme sayılmaz.
+"""
+
+LATENCY_KEYS = ("p50_ms", "p95_ms")
+SQL_SLACK = 0.1
+
+
+def compare_results(baseline: dict, current: dict, tolerance: float) -> tuple[list[str], list[str]]:
+    """Dönüş: (rapor satırları, gerileme açıklamaları)"""
+    lines, regressions = [], []
+    for name, base in baseline["scenarios"].items():
+        now = current["scenarios"].get(name)
+        if now is None:
+            lines.append(f"{name}: yeni sonuçta yok, atlandı")
+            continue
+
+        lines.append(
+            f"{name}: p50 {base['p50_ms']:.1f} → {now['p50_ms']:.1f} ms, "
+            f"p95 {base['p95_ms']:.1f} → {now['p95_ms']:.1f} ms, "
+            f"p99 {base['p99_ms']:.1f} → {now['p99_ms']:.1f} ms, "
+            f"{base['throughput_rps']:.1f} → {now['throughput_rps']:.1f} istek/sn, "
+            f"SQL {base['sql_per_request']} → {now['sql_per_request']}"
+        )
+
+        for key in LATENCY_KEYS:
+            if now[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{name}: {key} {base[key]:.1f} → {now[key]:.1f} ms")
+        if now["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: işlem hacmi {base['throughput_rps']:.1f} → {now['throughput_rps']:.1f} istek/sn"
+            )
+        if now["errors"] > base["errors"]:
+            regressions.append(f"{name}: hata {base['errors']} → {now['errors']}")
+        if (base["sql_per_request"] is not None and now["sql_per_request"] is not None
+                and now["sql_per_request"] > base["sql_per_request"] + SQL_SLACK):
+            regressions.append(
+                f"{name}: istek başına SQL {base['sql_per_request']} → {now['sql_per_request']}"
+            )
+
+    if baseline["meta"].get("mode") != current["meta"].get("mode") \
+            or baseline["meta"].get("sizes") != current["meta"].get("sizes"):
+        lines.append("Uyarı: koşu modu veya veri boyutları farklı; sonuçlar doğrudan karşılaştırılamaz.")
+    return lines, regressions
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+İstekleri uygulamaya ileten sürücüler.
+
+inprocess: Starlette TestClient; ağ ve sunucu maliyeti yok, uygulama kodunu ölçer.
+uvicorn:   gerçek sunucu (çok işçili) alt süreçte; httpx ile yerel ağ üzerinden.
+"""
+import os
+import subprocess
+import sys
+import time
+import httpx
+from bench.environment import BACKEND_DIR
+
+
+class InProcessDriver:
+    name = "inprocess"
+    workers = 1
+
+    def __enter__(self):
+        from fastapi.testclient import TestClient
+        from app.main import app
+        # with: lifespan (PDF havuzu, katalog) canlı sunucudaki gibi çalışsın
+        self.client = TestClient(app).__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        self.client.__exit__(*exc)
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        return self.client.request(method, url, **kwargs)
+
+
+class UvicornDriver:
+    name = "uvicorn"
+
+    def __init__(self, workers: int, port: int, startup_timeout: float = 60.0):
+        self.workers = workers
+        self.port = port
+        self.startup_timeout = startup_timeout
+
+    def __enter__(self):
+        # Ortam (MFP_DATABASE_URL vb.) alt süreçlere aynen geçer
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "app.main:app",
+                "--host", "127.0.0.1", "--port", str(self.port),
+                "--workers", str(self.workers), "--log-level", "warning",
+            ],
+            cwd=BACKEND_DIR,
+            env=os.environ.copy(),
+        )
+        base_url = f"http://127.0.0.1:{self.port}"
+        limits = httpx.Limits(max_connections=256, max_keepalive_connections=256)
+        self.client = httpx.Client(base_url=base_url, timeout=120.0, limits=limits)
+        self._wait_ready()
+        return self
+
+    def _wait_ready(self):
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"uvicorn başlatılamadı (çıkış kodu {self.process.returncode})")
+            try:
+                if self.client.get("/").status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            time.sleep(0.2)
+        self.__exit__(None, None, None)
+        raise RuntimeError("uvicorn zamanında hazır olmadı")
+
+    def __exit__(self, *exc):
+        self.client.close()
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        return self.client.request(method, url, **kwargs)
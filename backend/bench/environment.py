@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+Ölçüm ortamı: uygulama modülleri içe aktarılmadan önce çağrılmalıdır
+(ayarlar içe aktarma anında okunur).
+"""
+import os
+import shutil
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+DEFAULT_WORKDIR = os.path.join(BENCH_DIR, "data")
+
+
+def database_path(workdir: str) -> str:
+    return os.path.join(workdir, "bench.db")
+
+
+def configure_environment(workdir: str, fresh_pdf_cache: bool = True):
+    """Veritabanını ve PDF önbelleğini workdir'e yönlendirir (uvicorn alt süreçleri de devralır)"""
+    workdir = os.path.abspath(workdir)
+    os.makedirs(workdir, exist_ok=True)
+    pdf_cache = os.path.join(workdir, "pdf_cache")
+    # Önceki koşunun PDF'leri önbellekten dönmesin: her koşu aynı işi ölçer
+    if fresh_pdf_cache:
+        shutil.rmtree(pdf_cache, ignore_errors=True)
+    os.environ["MFP_DATABASE_URL"] = f"sqlite:///{database_path(workdir)}"
+    os.environ["MFP_PDF_CACHE_DIR"] = pdf_cache
+
+
+def git_commit() -> str | None:
+    """Sonuç dosyasına yazılan kısa commit kimliği (git yoksa None)"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import platform
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from bench.environment import git_commit
+from bench.scenarios import BenchContext, Scenario
+from bench.seed import BENCH_PASSWORD, BENCH_USERS
+from bench.stats import summarize, sql_statements
+
+
+def login_all(driver) -> dict[str, str]:
+    """Senaryolar için her ölçüm kullanıcısının token'ı (bir kez, ölçüm dışında)"""
+    tokens = {}
+    for username in BENCH_USERS:
+        response = driver.request(
+            "POST", "/auth/login", data={"username": username, "password": BENCH_PASSWORD}
+        )
+        response.raise_for_status()
+        tokens[username] = response.json()["access_token"]
+    return tokens
+
+
+def run_scenario(driver, scenario: Scenario, ctx: BenchContext,
+                 requests: int, concurrency: int, warmup: int, seed: int) -> dict:
+    """
+    Senaryoyu concurrency thread ile toplam requests kez çalıştırır.
+    Isınma istekleri (önbellekler, bağlantılar) sonuca katılmaz.
+    """
+    warm_rng = random.Random(f"{seed}:{scenario.name}:warmup")
+    for _ in range(warmup):
+        method, url, kwargs = scenario.build(ctx, warm_rng)
+        driver.request(method, url, **kwargs)
+
+    # Her thread kendi üreteciyle: istek dizisi thread sayısı aynıysa tekrarlanır
+    shares = [requests // concurrency + (1 if i < requests % concurrency else 0) for i in range(concurrency)]
+
+    def worker(index: int):
+        rng = random.Random(f"{seed}:{scenario.name}:{index}")
+        latencies, statements, errors = [], [], 0
+        for _ in range(shares[index]):
+            method, url, kwargs = scenario.build(ctx, rng)
+            started = time.perf_counter()
+            response = driver.request(method, url, **kwargs)
+            elapsed = time.perf_counter() - started
+            if response.status_code not in scenario.expected:
+                errors += 1
+                continue
+            latencies.append(elapsed)
+            count = sql_statements(response.headers.get("server-timing"))
+            if count is not None:
+                statements.append(count)
+        return latencies, statements, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(worker, range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [value for result in results for value in result[0]]
+    statements = [value for result in results for value in result[1]]
+    errors = sum(result[2] for result in results)
+    return summarize(latencies, elapsed, errors, statements)
+
+
+def run_meta(driver, sizes: dict, args) -> dict:
+    return dict(
+        started_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        mode=driver.name,
+        workers=driver.workers,
+        concurrency=args.concurrency,
+        requests=args.requests,
+        warmup=args.warmup,
+        seed=args.seed,
+        sizes=sizes,
+        python=platform.python_version(),
+        platform=platform.platform(),
+        commit=git_commit(),
+    )
+
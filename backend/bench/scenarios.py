@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Ölçülen istekler. Her senaryo, tohumlanmış rastgele üreteçle bir sonraki
+isteği (metot, yol, httpx argümanları) üretir; böylece aynı tohum aynı
+istek dizisini verir.
+"""
+import random
+from bench.seed import BENCH_PASSWORD, random_lines
+
+
+class BenchContext:
+    """Senaryoların ortak bilgisi: veri boyutları ve hazır token'lar"""
+
+    def __init__(self, sizes: dict, tokens: dict[str, str]):
+        self.sizes = sizes
+        self.tokens = tokens
+
+    def auth(self, username: str) -> dict:
+        return {"Authorization": f"Bearer {self.tokens[username]}"}
+
+
+class Scenario:
+    __slots__ = ("name", "build", "expected")
+
+    def __init__(self, name: str, build, expected=(200,)):
+        self.name = name
+        self.build = build          # (ctx, rng) → (metot, yol, argümanlar)
+        self.expected = expected
+
+
+def _login(ctx: BenchContext, rng: random.Random):
+    return "POST", "/auth/login", dict(data={"username": "bench_rep", "password": BENCH_PASSWORD})
+
+
+def _list_products(ctx: BenchContext, rng: random.Random):
+    after = rng.randrange(max(1, ctx.sizes["products"] - 100))
+    return "GET", f"/products/?limit=100&after={after}", {}
+
+
+def _list_invoices(ctx: BenchContext, rng: random.Random):
+    after = rng.randrange(max(1, ctx.sizes["invoices"] - 100))
+    return "GET", f"/invoices/?limit=100&after={after}", dict(headers=ctx.auth("bench_admin"))
+
+
+def _create_invoice(ctx: BenchContext, rng: random.Random):
+    body = dict(
+        customer_id=rng.randint(1, ctx.sizes["customers"]),
+        items=[line.model_dump() for line in random_lines(rng, ctx.sizes["products"], ctx.sizes["lines"])],
+    )
+    return "POST", "/invoices/create", dict(json=body, headers=ctx.auth("bench_rep"))
+
+
+def _invoice_pdf(ctx: BenchContext, rng: random.Random):
+    invoice_id = rng.randint(1, ctx.sizes["invoices"])
+    return "GET", f"/invoices/{invoice_id}/pdf", dict(headers=ctx.auth("bench_admin"))
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("login", _login),
+        Scenario("list_products", _list_products),
+        Scenario("list_invoices", _list_invoices),
+        Scenario("create_invoice", _create_invoice),
+        Scenario("invoice_pdf", _invoice_pdf),
+    )
+}
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Ölçüm veritabanını sentetik veriyle doldurur.
+
+Aynı tohum (seed) ve boyutlar her seferinde aynı veriyi üretir. Faturalar
+uygulamanın kendi fiyatlama, numaralama ve satış özeti koduyla yazılır;
+tutarlar ve özet tablolar canlı kayıtlarla aynı kurallara uyar.
+"""
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import insert, select
+from app.database import SessionLocal, engine
+from app.core.migrations import upgrade
+from app.core.catalog import load_snapshot, bump_catalog_version
+from app.core.invoice_numbers import allocate_invoice_numbers, format_fatura_no
+from app.core.pricing import price_invoices
+from app.core.sales_summary import record_invoice_sales
+from app.core.security import get_password_hash
+from app.models.customer import Customer
+from app.models.invoice import Invoice, InvoiceItem
+from app.models.product import Product, VatRateEnum
+from app.models.user import User, RoleEnum
+from app.schemas.invoice import InvoiceItemCreate
+
+BENCH_PASSWORD = "bench-parola"
+BENCH_USERS = {
+    "bench_admin": RoleEnum.admin,
+    "bench_rep": RoleEnum.representative,
+    "bench_viewer": RoleEnum.viewer,
+    "bench_customer": RoleEnum.customer,
+}
+SEED_START = datetime(2025, 1, 1)   # sabit: tarih ve fatura numaraları koşudan koşuya değişmez
+CHUNK = 1000
+VAT_RATES = [rate for rate in VatRateEnum if rate is not VatRateEnum.special]
+
+
+def seed_database(customers: int, products: int, invoices: int, lines: int = 5, seed: int = 42) -> dict:
+    """Boş veritabanını doldurur; veri varsa RuntimeError"""
+    upgrade(engine)
+    rng = random.Random(seed)
+    db = SessionLocal()
+    try:
+        if db.execute(select(Customer.id).limit(1)).first() is not None:
+            raise RuntimeError("Ölçüm veritabanı boş değil; --reseed ile yeniden oluşturun.")
+
+        _seed_customers(db, rng, customers)
+        _seed_products(db, rng, products)
+        _seed_users(db)
+        db.commit()
+        _seed_invoices(db, rng, customers, invoices, lines)
+    finally:
+        db.close()
+    return dict(customers=customers, products=products, invoices=invoices, lines=lines, seed=seed)
+
+
+def _seed_customers(db, rng: random.Random, count: int):
+    rows = [
+        dict(
+            name=f"Müşteri {i:05d} Ticaret Ltd. Şti.",
+            tax_number=str(rng.randrange(10 ** 9, 10 ** 10)),
+            address=f"{rng.choice(['Atatürk', 'İnönü', 'Cumhuriyet', 'Gazi'])} Cad. No:{rng.randint(1, 200)}",
+            phone=f"05{rng.randrange(10 ** 8, 10 ** 9)}",
+            default_discount=rng.choice([0.0, 0.0, 5.0, 10.0]),
+        )
+        for i in range(1, count + 1)
+    ]
+    for start in range(0, len(rows), CHUNK):
+        db.execute(insert(Customer), rows[start:start + CHUNK])
+
+
+def _seed_products(db, rng: random.Random, count: int):
+    rows = [
+        dict(
+            name=f"{rng.choice(['Çay', 'Şeker', 'Un', 'Yağ', 'Pirinç', 'Makarna'])} Ürün {i:05d}",
+            barcode=f"869{i:010d}",
+            unit_price=round(rng.uniform(1, 2000), 2),
+            vat_rate=rng.choice(VAT_RATES),
+        )
+        for i in range(1, count + 1)
+    ]
+    for start in range(0, len(rows), CHUNK):
+        db.execute(insert(Product), rows[start:start + CHUNK])
+    bump_catalog_version(db)
+
+
+def _seed_users(db):
+    # Tek hash yeterli: bcrypt maliyeti girişte ölçülür, tohumlamada değil
+    password_hash = get_password_hash(BENCH_PASSWORD)
+    db.execute(insert(User), [
+        dict(
+            username=username,
+            email=f"{username}@bench.local",
+            password_hash=password_hash,
+            role=role,
+            customer_id=1 if role == RoleEnum.customer else None,
+        )
+        for username, role in BENCH_USERS.items()
+    ])
+
+
+def random_lines(rng: random.Random, product_count: int, lines: int) -> list[InvoiceItemCreate]:
+    return [
+        InvoiceItemCreate(
+            product_id=rng.randint(1, product_count),
+            quantity=rng.choice([1, 1, 2, 3, 5, 10, 0.5, 2.75]),
+            discount_rate=rng.choice([0.0, 0.0, 0.0, 5.0, 12.5]),
+        )
+        for _ in range(rng.randint(1, lines))
+    ]
+
+
+def _seed_invoices(db, rng: random.Random, customers: int, count: int, lines: int):
+    snapshot = load_snapshot(db)
+    product_count = len(snapshot.products)
+    dates = sorted(SEED_START + timedelta(seconds=rng.randrange(365 * 86400)) for _ in range(count))
+
+    for start in range(0, count, CHUNK):
+        chunk_dates = dates[start:start + CHUNK]
+        chunk_lines = [random_lines(rng, product_count, lines) for _ in chunk_dates]
+        priced = price_invoices(chunk_lines, snapshot.products)
+
+        numbers = allocate_invoice_numbers(db, SEED_START.year, len(chunk_dates))
+        invoice_rows = [
+            dict(
+                date=day,
+                customer_id=rng.randint(1, customers),
+                fatura_no=format_fatura_no(SEED_START.year, number),
+                catalog_version=snapshot.version,
+                **invoice.totals(),
+            )
+            for day, number, invoice in zip(chunk_dates, numbers, priced)
+        ]
+        inserted = db.execute(insert(Invoice).returning(Invoice.id, Invoice.fatura_no), invoice_rows)
+        ids_by_no = {fatura_no: invoice_id for invoice_id, fatura_no in inserted}
+
+        item_rows = [
+            dict(item, invoice_id=ids_by_no[row["fatura_no"]])
+            for row, invoice in zip(invoice_rows, priced)
+            for item in invoice.item_rows()
+        ]
+        db.execute(insert(InvoiceItem), item_rows)
+        record_invoice_sales(db, [(row, invoice.lines) for row, invoice in zip(invoice_rows, priced)])
+        db.commit()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Yanıt serileştirme ölçümü: büyük liste yanıtlarının iki yolu karşılaştırılır.
+
+  encoder: response_model yok → jsonable_encoder + JSONResponse (json.dumps)
+  model:   response_model (pydantic-core) + ORJSONResponse (orjson)
+
+Satırlar sayfalama ve ORM nesnelerinden gelen biçimlerle üretilir; veritabanı
+ve HTTP katmanı dışarıda tutulur, yalnız serileştirme süresi ölçülür.
+"""
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+from app.models.customer import Customer
+from app.models.product import VatRateEnum
+from app.schemas.customer import CustomerResponse
+from app.schemas.invoice import InvoiceListItem
+from app.schemas.product import ProductListItem
+
+
+def _invoice_rows(rng: random.Random, count: int) -> list[dict]:
+    start = datetime(2025, 1, 1)
+    return [
+        dict(
+            id=i, fatura_no=f"FAT-2025-{i:05d}", date=start + timedelta(minutes=i), customer_id=rng.randint(1, 500),
+            subtotal=round(rng.uniform(10, 5000), 2), discount_total=0.0,
+            vat_total=round(rng.uniform(1, 1000), 2), grand_total=round(rng.uniform(10, 6000), 2),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def _product_rows(rng: random.Random, count: int) -> list[dict]:
+    return [
+        dict(id=i, name=f"Ürün {i:05d}", barcode=f"869{i:010d}",
+             unit_price=round(rng.uniform(1, 2000), 2), vat_rate=rng.choice(list(VatRateEnum)))
+        for i in range(1, count + 1)
+    ]
+
+
+def _customer_objects(rng: random.Random, count: int) -> list[Customer]:
+    # Oturuma bağlanmamış ORM nesneleri: jsonable_encoder'ın yansıtma yolu için
+    return [
+        Customer(id=i, name=f"Müşteri {i:05d}", tax_number=str(rng.randrange(10 ** 9, 10 ** 10)),
+                 address="Atatürk Cad.", phone="05000000000", default_discount=0.0)
+        for i in range(1, count + 1)
+    ]
+
+
+def _encoder_path(rows) -> bytes:
+    return JSONResponse(jsonable_encoder(rows)).body
+
+
+def _model_path(adapter: TypeAdapter, rows) -> bytes:
+    # FastAPI'nin response_model yolu: doğrula → JSON uyumlu Python → yanıt sınıfı
+    content = adapter.dump_python(adapter.validate_python(rows), mode="json", exclude_unset=True)
+    return ORJSONResponse(content).body
+
+
+def _time(fn, runs: int) -> tuple[float, int]:
+    """Medyan süre (ms) ve tek çağrının en yüksek bellek ayırımı (bayt)"""
+    fn()
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(samples), peak
+
+
+def measure_serialization(rows: int, runs: int, seed: int = 42) -> dict:
+    rng = random.Random(seed)
+    cases = {
+        "invoice_list": (_invoice_rows(rng, rows), TypeAdapter(list[InvoiceListItem])),
+        "product_list": (_product_rows(rng, rows), TypeAdapter(list[ProductListItem])),
+        "customer_orm": (_customer_objects(rng, rows), TypeAdapter(list[CustomerResponse])),
+    }
+    results = {}
+    for name, (data, adapter) in cases.items():
+        encoder_ms, encoder_peak = _time(lambda: _encoder_path(data), runs)
+        model_ms, model_peak = _time(lambda: _model_path(adapter, data), runs)
+        results[name] = dict(
+            rows=rows,
+            encoder_ms=round(encoder_ms, 3),
+            model_ms=round(model_ms, 3),
+            speedup=round(encoder_ms / model_ms, 2) if model_ms else None,
+            encoder_peak_kib=round(encoder_peak / 1024, 1),
+            model_peak_kib=round(model_peak / 1024, 1),
+        )
+    return results
+
+
+def compare_serialization(base: dict, now: dict, tolerance: float) -> tuple[list[str], list[str]]:
+    lines, regressions = [], []
+    for name, before in base.items():
+        after = now.get(name)
+        if after is None:
+            continue
+        lines.append(f"serialization {name}: {before['model_ms']:.2f} → {after['model_ms']:.2f} ms")
+        if after["model_ms"] > before["model_ms"] * (1 + tolerance):
+            regressions.append(f"serialization {name}: {before['model_ms']:.2f} → {after['model_ms']:.2f} ms")
+    return lines, regressions
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Uygulama açılış (import) süresi ölçümü.
+
+Her koşu temiz bir Python sürecinde `import app.main` süresini ölçer; yavaş
+yüklenen ve yalnız PDF üretiminde gereken paketlerin (WeasyPrint yığını)
+bu sırada yüklenmediğini de denetler. Bu denetim süreden bağımsızdır ve
+gürültüsüzdür: ihlal her zaman gerilemedir.
+"""
+import json
+import statistics
+import subprocess
+import sys
+from bench.environment import BACKEND_DIR
+
+# app.main içe aktarılırken yüklenmemesi gereken paketler
+LAZY_MODULES = ("weasyprint", "pydyf", "fontTools", "tinycss2", "cssselect2", "PIL")
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "loaded": sorted(m for m in %r if m in sys.modules)}))
+""" % (LAZY_MODULES,)
+
+
+def _probe(extra_args=()) -> tuple[dict, str]:
+    completed = subprocess.run(
+        [sys.executable, *extra_args, "-c", _PROBE],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1]), completed.stderr
+
+
+def top_imports(importtime_output: str, limit: int = 10) -> list[dict]:
+    """-X importtime çıktısından en pahalı dış paketler (kümülatif; uygulamanın kendisi hariç)"""
+    by_package: dict[str, int] = {}
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        if package in ("app", "json"):
+            continue
+        # Paketin en dıştaki içe aktarılışı alt modüllerini de kapsar
+        by_package[package] = max(by_package.get(package, 0), int(cumulative))
+    heaviest = sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [dict(module=package, cumulative_ms=round(micros / 1000, 1)) for package, micros in heaviest]
+
+
+def measure_startup(runs: int) -> dict:
+    """runs adet temiz süreçte ölçer; ilk koşu disk önbelleğini ısıtmak için atılır"""
+    _probe()
+    samples, loaded = [], set()
+    for _ in range(runs):
+        result, _ = _probe()
+        samples.append(result["seconds"] * 1000)
+        loaded.update(result["loaded"])
+
+    _, importtime = _probe(("-X", "importtime"))
+    return dict(
+        runs=runs,
+        median_ms=round(statistics.median(samples), 1),
+        min_ms=round(min(samples), 1),
+        max_ms=round(max(samples), 1),
+        lazy_modules_loaded=sorted(loaded),
+        top_imports=top_imports(importtime),
+    )
+
+
+def compare_startup(base: dict, now: dict, tolerance: float) -> tuple[list[str], list[str]]:
+    lines = [
+        f"startup: medyan {base['median_ms']:.1f} → {now['median_ms']:.1f} ms, "
+        f"en düşük {base['min_ms']:.1f} → {now['min_ms']:.1f} ms"
+    ]
+    regressions = []
+    if now["median_ms"] > base["median_ms"] * (1 + tolerance):
+        regressions.append(f"startup: medyan {base['median_ms']:.1f} → {now['median_ms']:.1f} ms")
+    if now["lazy_modules_loaded"]:
+        regressions.append(f"startup: açılışta yüklenen PDF paketleri: {', '.join(now['lazy_modules_loaded'])}")
+    return lines, regressions
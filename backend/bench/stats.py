@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+import math
+import re
+
+# Server-Timing içindeki SQL ölçümü: db;dur=1.2;desc="3 queries"
+DB_TIMING = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Doğrusal aradeğerlemeli yüzdelik (q: 0–100); liste sıralı olmalı"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return sorted_values[lower]
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def sql_statements(server_timing: str | None) -> int | None:
+    """Yanıttaki SQL ifadesi sayısı; ölçümler kapalıysa (başlık yok) None"""
+    if server_timing is None:
+        return None
+    match = DB_TIMING.search(server_timing)
+    return int(match.group(1)) if match else 0
+
+
+def summarize(latencies: list[float], elapsed: float, errors: int, statements: list[int]) -> dict:
+    """Gecikmeler saniye gelir, milisaniye yazılır"""
+    values = sorted(latencies)
+    ms = lambda seconds: round(seconds * 1000, 3)  # noqa: E731
+    return dict(
+        requests=len(values),
+        errors=errors,
+        elapsed_s=round(elapsed, 3),
+        throughput_rps=round(len(values) / elapsed, 2) if elapsed > 0 else 0.0,
+        mean_ms=ms(sum(values) / len(values)) if values else 0.0,
+        p50_ms=ms(percentile(values, 50)),
+        p95_ms=ms(percentile(values, 95)),
+        p99_ms=ms(percentile(values, 99)),
+        max_ms=ms(values[-1]) if values else 0.0,
+        sql_per_request=round(sum(statements) / len(statements), 2) if statements else None,
+    )
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Testler bellek içi SQLite ile çalışır; ayarlar uygulama içe aktarılmadan
+önce ortam değişkenleriyle verilir (Settings içe aktarmada okunur).
+"""
+import os
+
+os.environ.setdefault("MFP_DATABASE_URL", "sqlite://")
+os.environ.setdefault("MFP_PDF_WORKERS", "0")       # PDF'ler süreç havuzu yerine threadpool'da
+os.environ.setdefault("MFP_PDF_CACHE_DIR", "")      # yalnız bellek önbelleği
+os.environ.setdefault("MFP_AUTO_MIGRATE", "false")
+os.environ.setdefault("MFP_BCRYPT_ROUNDS", "4")      # testte hız için en düşük maliyet
+
+import sys
+import types
+import pytest
+from fastapi.testclient import TestClient
+from app.core.migrations import upgrade
+from app.core.principals import Principal
+from app.core.security import get_current_user
+from app.database import SessionLocal, engine
+from app.main import app
+from app.models.customer import Customer
+from app.models.product import Product, VatRateEnum
+from app.models.user import RoleEnum
+
+SEED_PRODUCTS = 25      # bir faturadaki en fazla satır kadar ürün (id 1..25)
+
+ADMIN = Principal(id=1, username="admin", email="admin@mfp.com", role=RoleEnum.admin, customer_id=None)
+
+
+def fake_weasyprint() -> dict[str, types.ModuleType]:
+    """Yerleşim yapmadan HTML'i "%PDF" önekiyle geri veren en küçük WeasyPrint yüzeyi"""
+    class Document:
+        def __init__(self, html: str, pages=(None,)):
+            self.html = html
+            self.pages = list(pages)
+
+        def copy(self, pages):
+            return Document(self.html, pages)
+
+        def write_pdf(self, target=None, **kwargs):
+            return b"%PDF-1.7\n" + self.html.encode("utf-8")
+
+    class HTML:
+        def __init__(self, string=None, base_url=None, **kwargs):
+            self.string = string
+
+        def render(self, **kwargs):
+            return Document(self.string)
+
+    weasyprint = types.ModuleType("weasyprint")
+    weasyprint.HTML = HTML
+    weasyprint.CSS = lambda **kwargs: object()
+    text = types.ModuleType("weasyprint.text")
+    fonts = types.ModuleType("weasyprint.text.fonts")
+    fonts.FontConfiguration = object
+    return {"weasyprint": weasyprint, "weasyprint.text": text, "weasyprint.text.fonts": fonts}
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Şeması kurulmuş, bir müşteri ve SEED_PRODUCTS ürün içeren uygulama; kullanıcı admin"""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        for name, module in fake_weasyprint().items():
+            monkeypatch.setitem(sys.modules, name, module)
+
+        upgrade(engine)
+        with SessionLocal() as db:
+            db.add(Customer(name="Test Müşteri"))
+            db.add_all(
+                Product(
+                    name=f"Ürün {index}", barcode=f"869{index:010d}",
+                    unit_price=1.5 + index, vat_rate=VatRateEnum.standard,
+                )
+                for index in range(SEED_PRODUCTS)
+            )
+            db.commit()
+
+        app.dependency_overrides[get_current_user] = lambda: ADMIN
+        try:
+            with TestClient(app) as test_client:
+                yield test_client
+        finally:
+            app.dependency_overrides.clear()
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Ürünü sonradan silinmiş faturanın PDF'i ve ZIP dışa aktarımı yine üretilir"""
+import io
+import zipfile
+import pytest
+from app.core.catalog import bump_catalog_version, catalog
+from app.database import SessionLocal
+from app.models.product import Product, VatRateEnum
+
+
+@pytest.fixture
+def orphan_invoice(client) -> int:
+    """Tek satırı silinmiş bir ürüne ait fatura"""
+    with SessionLocal() as db:
+        product = Product(
+            name="Silinecek Ürün", barcode="8690000099999", unit_price=10.0, vat_rate=VatRateEnum.standard,
+        )
+        db.add(product)
+        bump_catalog_version(db)
+        db.commit()
+        product_id = product.id
+    catalog.invalidate()
+
+    items = [dict(product_id=product_id, quantity=1)]
+    response = client.post("/invoices/create", json=dict(customer_id=1, items=items))
+    assert response.status_code == 200
+    invoice_id = int(response.headers["content-disposition"].split("_")[-1].split(".")[0])
+
+    with SessionLocal() as db:
+        db.delete(db.get(Product, product_id))
+        bump_catalog_version(db)
+        db.commit()
+    catalog.invalidate()
+    return invoice_id
+
+
+def test_pdf_of_invoice_with_deleted_product(client, orphan_invoice):
+    response = client.get(f"/invoices/{orphan_invoice}/pdf")
+
+    assert response.status_code == 200
+    html = response.content.decode("utf-8")
+    assert "Silinecek Ürün" not in html
+    assert "<td>-</td>" in html
+
+
+def test_zip_export_with_deleted_product(client, orphan_invoice):
+    response = client.get("/invoices/export/zip", params=dict(customer_id=1))
+
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        assert archive.testzip() is None
+        assert len(archive.namelist()) >= 1
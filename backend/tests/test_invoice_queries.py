@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Fatura oluşturma ve PDF alma, satır sayısından bağımsız, sabit sayıda SQL
+ifadesiyle çalışmalı (satır başına sorgu yok). Ölçüm imleç (cursor)
+çalıştırmaları sayılarak yapılır; WeasyPrint yerine sahte modül kullanılır.
+"""
+import pytest
+from sqlalchemy import event
+from app.database import engine
+
+LINES = 25
+MAX_CREATE_STATEMENTS = 14     # müşteri, katalog sürümü, sayaç, fatura, satırlar, özetler, yeniden okuma
+MAX_PDF_STATEMENTS = 2         # fatura + müşteri + satırlar + ürünler tek sorguda
+
+
+@pytest.fixture
+def statements():
+    executed = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    yield executed
+    event.remove(engine, "before_cursor_execute", count)
+
+
+def create_invoice(client) -> int:
+    items = [dict(product_id=product_id, quantity=2, discount_rate=5.0) for product_id in range(1, LINES + 1)]
+    response = client.post("/invoices/create", json=dict(customer_id=1, items=items))
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    return int(response.headers["content-disposition"].split("_")[-1].split(".")[0])
+
+
+def test_create_invoice_statement_count(client, statements):
+    create_invoice(client)
+    assert len(statements) <= MAX_CREATE_STATEMENTS, statements
+
+
+def test_invoice_pdf_statement_count(client, statements):
+    invoice_id = create_invoice(client)
+    statements.clear()
+
+    response = client.get(f"/invoices/{invoice_id}/pdf")
+    assert response.status_code == 200
+    assert response.content.startswith(b"%PDF")
+    assert len(statements) <= MAX_PDF_STATEMENTS, statements
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""Sayım önbelleği istemci filtreleriyle sınırsız büyümez"""
+from app.core import pagination
+from app.core.pagination import CountCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = CountCache(ttl=30, max_entries=3)
+    for prefix in ("A", "B", "C"):
+        cache.put(("invoices", prefix), 1)
+    assert cache.get(("invoices", "A")) == 1     # A yeni kullanıldı, en eski B
+
+    cache.put(("invoices", "D"), 4)
+
+    assert len(cache) == 3
+    assert cache.get(("invoices", "B")) is None
+    assert cache.get(("invoices", "A")) == 1
+    assert cache.get(("invoices", "D")) == 4
+
+
+def test_expired_entries_are_swept_before_eviction(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(pagination.time, "monotonic", lambda: now[0])
+    cache = CountCache(ttl=30, max_entries=3)
+    cache.put(("invoices", "eski"), 1)
+    now[0] += 20
+    cache.put(("invoices", "A"), 2)
+    cache.put(("invoices", "B"), 3)
+    now[0] += 15                                  # "eski" doldu, A ve B geçerli
+
+    cache.put(("invoices", "C"), 4)
+    cache.put(("invoices", "D"), 5)
+
+    assert len(cache) == 3
+    assert cache.get(("invoices", "eski")) is None
+    assert cache.get(("invoices", "A")) is None     # en eski geçerli kayıt sınır için düştü
+    assert [cache.get(("invoices", key)) for key in ("B", "C", "D")] == [3, 4, 5]
+
+
+def test_many_distinct_filters_stay_bounded():
+    cache = CountCache(ttl=30, max_entries=100)
+    for min_total in range(10_000):
+        cache.put(("invoices", None, min_total), min_total)
+    assert len(cache) == 100
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""Aynı süreçte uygulama yeniden açıldığında (ikinci lifespan) bcrypt havuzu yeniden kurulur"""
+from fastapi.testclient import TestClient
+from app.main import app
+
+
+def test_login_after_second_lifespan(client):
+    response = client.post(
+        "/auth/register",
+        data=dict(username="kasiyer", email="kasiyer@mfp.com", password="parola", role="representative"),
+    )
+    assert response.status_code == 200
+
+    # İkinci yaşam döngüsü kapanırken havuzu kapatır; sonraki giriş yeni havuzla yapılmalı
+    with TestClient(app):
+        pass
+
+    response = client.post("/auth/login", data=dict(username="kasiyer", password="parola"))
+    assert response.status_code == 200
+    assert response.json()["access_token"]
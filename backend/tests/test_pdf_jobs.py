@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Zaman aşımına uğrayan işler deneme hakkı kadar yeniden alınır, sonra başarısız sayılır"""
+from datetime import datetime, timedelta
+import pytest
+from app.core.config import settings
+from app.core.migrations import upgrade
+from app.core.pdf_jobs import claim_next_job, run_worker, try_claim_job
+from app.database import SessionLocal, engine
+from app.models.invoice import Invoice
+from app.models.pdf_job import PdfJob, PdfJobStatus
+
+
+@pytest.fixture
+def db():
+    upgrade(engine)
+    with SessionLocal() as db:
+        yield db
+        db.rollback()
+        db.query(PdfJob).delete()
+        db.query(Invoice).filter(Invoice.fatura_no.like("TEST-JOB-%")).delete(synchronize_session=False)
+        db.commit()
+
+
+def stale_job(db, attempts: int) -> int:
+    invoice = Invoice(fatura_no=f"TEST-JOB-{attempts}")
+    db.add(invoice)
+    db.flush()
+    job = PdfJob(
+        invoice_id=invoice.id,
+        status=PdfJobStatus.running,
+        attempts=attempts,
+        started_at=datetime.now() - timedelta(seconds=settings.pdf_job_timeout + 60),
+    )
+    db.add(job)
+    db.commit()
+    return job.id
+
+
+def test_stale_job_is_reclaimed_until_attempts_run_out(db):
+    exhausted = stale_job(db, settings.pdf_job_max_attempts)
+    retried = stale_job(db, settings.pdf_job_max_attempts - 1)
+
+    job = claim_next_job(db, "test-worker")
+    assert job.id == retried
+    assert job.attempts == settings.pdf_job_max_attempts
+
+    failed = db.get(PdfJob, exhausted)
+    db.refresh(failed)
+    assert failed.status == PdfJobStatus.failed
+    assert failed.finished_at is not None
+    assert claim_next_job(db, "test-worker") is None
+
+
+def test_two_claimers_race_on_one_stale_job(db):
+    job_id = stale_job(db, attempts=1)
+
+    # İki işçi işi aynı anda "running, 1 deneme" olarak okumuş olsun
+    with SessionLocal() as other:
+        first = try_claim_job(db, "worker-a", job_id, PdfJobStatus.running, 1)
+        second = try_claim_job(other, "worker-b", job_id, PdfJobStatus.running, 1)
+
+    assert first is not None and first.worker == "worker-a"
+    assert second is None
+    assert first.attempts == 2
+
+
+def test_worker_requires_shared_pdf_cache(monkeypatch):
+    monkeypatch.setattr(settings, "pdf_cache_dir", "")
+    with pytest.raises(RuntimeError):
+        run_worker(once=True)
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Toplu dışa aktarma işçi sayısı kadar paralel çalışır, etkileşimli isteklere yer bırakır"""
+import asyncio
+import threading
+import time
+import pytest
+from app.core.pdf_pool import PdfRenderPool, RenderQueueFull
+
+
+class Gate:
+    """Açılana kadar bekleyen iş; aynı anda kaç tanesinin çalıştığını sayar"""
+
+    def __init__(self):
+        self.opened = threading.Event()
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, value):
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        self.opened.wait(5)
+        with self._lock:
+            self.running -= 1
+        return value
+
+
+async def wait_until(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.01)
+
+
+def test_bulk_renders_leave_room_for_interactive_requests():
+    # Süreç havuzu açılmadan (start yok) işler threadpool'da çalışır
+    pool = PdfRenderPool(workers=2, max_queue=3)
+    gate = Gate()
+
+    async def scenario():
+        bulk = asyncio.gather(*(pool.run(gate, index, wait=True) for index in range(20)))
+        await wait_until(lambda: gate.running == 2)
+        assert pool.pending == 2
+
+        # Kuyrukta kalan tek yer etkileşimli isteğe verilir, sonrakiler reddedilir
+        interactive = asyncio.ensure_future(pool.run(gate, "pdf"))
+        await wait_until(lambda: gate.running == 3)
+        with pytest.raises(RenderQueueFull):
+            await pool.run(gate, "pdf")
+
+        gate.opened.set()
+        return await bulk, await interactive
+
+    results, interactive = asyncio.run(scenario())
+    assert results == list(range(20))
+    assert interactive == "pdf"
+    assert gate.peak == 3
+    assert pool.pending == 0
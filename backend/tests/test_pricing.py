@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+price_invoices, eski float formülüyle (birim fiyat × miktar, iskonto, KDV)
+rastgele faturalarda karşılaştırılır: her satır adımı en fazla yarım kuruş
+yuvarlanır, toplamlar satırların tam toplamıdır.
+"""
+import random
+import pytest
+from app.core.catalog import CatalogProduct
+from app.core.pricing import price_invoices
+from app.schemas.invoice import InvoiceItemCreate
+
+VAT_RATES = (0.0, 1.0, 5.0, 10.0, 16.0, 20.0)
+DISCOUNT_RATES = (0.0, 0.0, 2.5, 5.0, 12.5, 33.0)
+QUANTITIES = (1, 2, 3, 0.5, 0.25, 2.75, 1.333, 12, 1000)
+
+
+def float_line(unit_price, quantity, discount_rate, vat_rate):
+    """Fiyatlama modülünden önceki hesap (yuvarlamasız float)"""
+    raw_total = unit_price * quantity
+    discount_amount = raw_total * discount_rate / 100
+    vat_amount = (raw_total - discount_amount) * vat_rate / 100
+    return raw_total, discount_amount, vat_amount, raw_total - discount_amount + vat_amount
+
+
+def random_price(rng: random.Random) -> float:
+    # Kuruş altı fiyatlar da (0,333 TL gibi) Float sütunda saklanabilir
+    return rng.choice([
+        round(rng.uniform(0.01, 5000), 2),
+        round(rng.uniform(0.001, 10), 3),
+        round(rng.uniform(0.0001, 1), 4),
+    ])
+
+
+def random_case(rng: random.Random):
+    products = {
+        product_id: CatalogProduct(product_id, f"Ürün {product_id}", random_price(rng), rng.choice(VAT_RATES))
+        for product_id in range(1, 21)
+    }
+    invoices = [
+        [
+            InvoiceItemCreate(
+                product_id=rng.randint(1, 20),
+                quantity=rng.choice(QUANTITIES),
+                discount_rate=rng.choice(DISCOUNT_RATES),
+            )
+            for _ in range(rng.randint(1, 25))
+        ]
+        for _ in range(20)
+    ]
+    return products, invoices
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_lines_match_float_formula(seed):
+    rng = random.Random(seed)
+    products, invoices = random_case(rng)
+
+    for lines, priced in zip(invoices, price_invoices(invoices, products)):
+        assert len(priced.lines) == len(lines)
+        for line, result in zip(lines, priced.lines):
+            product = products[line.product_id]
+            subtotal, discount, vat, total = float_line(
+                product.unit_price, line.quantity, line.discount_rate, product.vat_rate
+            )
+            row = result.item_row()
+            assert row["unit_price"] == product.unit_price
+            # Her adım yarım kuruş yuvarlanır; iskonto ve KDV önceki adımın hatasını oranla taşır
+            assert abs(result.subtotal / 100 - subtotal) <= 0.005 + 1e-9
+            assert abs(result.discount / 100 - discount) <= 0.01 + 1e-9
+            assert abs(result.vat / 100 - vat) <= 0.015 + 1e-9
+            assert abs(row["line_total"] - total) <= 0.02 + 1e-9
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_totals_are_exact_sums(seed):
+    rng = random.Random(1000 + seed)
+    products, invoices = random_case(rng)
+
+    for priced in price_invoices(invoices, products):
+        totals = priced.totals()
+        assert priced.subtotal == sum(line.subtotal for line in priced.lines)
+        assert priced.discount == sum(line.discount for line in priced.lines)
+        assert priced.vat == sum(line.vat for line in priced.lines)
+        assert priced.subtotal - priced.discount + priced.vat == priced.total
+        assert round(totals["subtotal"] - totals["discount_total"] + totals["vat_total"], 2) == totals["grand_total"]
+
+        breakdown = priced.vat_breakdown()
+        assert round(sum(entry["vat"] for entry in breakdown), 2) == totals["vat_total"]
+        assert round(sum(entry["base"] for entry in breakdown), 2) == round(
+            totals["subtotal"] - totals["discount_total"], 2
+        )
+
+
+def test_sub_kurus_unit_price_is_not_rounded():
+    products = {1: CatalogProduct(1, "Vida", 0.333, 20.0)}
+    priced = price_invoices([[InvoiceItemCreate(product_id=1, quantity=1000)]], products)[0]
+
+    assert priced.totals() == dict(subtotal=333.0, discount_total=0.0, vat_total=66.6, grand_total=399.6)
+    assert priced.item_rows()[0]["unit_price"] == 0.333
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""Kullanıcı değişince önbellekteki özet commit'ten sonra düşer, geri almada kalır"""
+import pytest
+from app.core.migrations import upgrade
+from app.core.principals import Principal, principal_cache
+from app.database import SessionLocal, engine
+from app.models.user import User, RoleEnum
+
+
+@pytest.fixture
+def user():
+    upgrade(engine)
+    with SessionLocal() as db:
+        user = User(username="temsilci", email="temsilci@mfp.com", password_hash="x", role=RoleEnum.representative)
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    principal_cache.put("token", Principal(user_id, "temsilci", "temsilci@mfp.com", RoleEnum.representative, None))
+    yield user_id
+    principal_cache.clear()
+    with SessionLocal() as db:
+        db.query(User).filter(User.id == user_id).delete()
+        db.commit()
+
+
+def test_invalidated_after_commit(user):
+    with SessionLocal() as db:
+        db.get(User, user).role = RoleEnum.admin
+        db.flush()
+        assert principal_cache.get("token") is not None
+        db.commit()
+    assert principal_cache.get("token") is None
+
+
+def test_kept_after_rollback(user):
+    with SessionLocal() as db:
+        db.delete(db.get(User, user))
+        db.flush()
+        db.rollback()
+        db.commit()
+    assert principal_cache.get("token") is not None
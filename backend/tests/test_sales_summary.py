@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Özetin yeniden oluşturulması, fatura kesilirken yazılan (artımlı) özetle aynı sonucu verir"""
+from datetime import date
+from sqlalchemy import select
+from app.core.catalog import bump_catalog_version, catalog
+from app.core.sales_summary import PRODUCT_TOTALS, rebuild_sales_summary
+from app.database import SessionLocal
+from app.models.product import Product, VatRateEnum
+from app.models.sales_summary import SalesDailyCustomer, SalesDailyProduct
+
+
+def summary_rows(db, model, key) -> dict:
+    rows = db.execute(select(model).where(model.day == date.today())).scalars()
+    return {getattr(row, key): row for row in rows}
+
+
+def product_totals(row) -> dict:
+    return {name: getattr(row, name) for name in PRODUCT_TOTALS}
+
+
+def customer_totals(db) -> dict:
+    return {key: row.grand_total for key, row in summary_rows(db, SalesDailyCustomer, "customer_id").items()}
+
+
+def test_rebuild_matches_incremental_on_half_kurus_line(client):
+    # 1,005 TL float olarak 1,00499… saklanır: SQL round() 1,00 verir, pricing 1,01
+    with SessionLocal() as db:
+        product = Product(
+            name="Yarım Kuruş", barcode="8690000088888", unit_price=1.005, vat_rate=VatRateEnum.standard,
+        )
+        db.add(product)
+        bump_catalog_version(db)
+        db.commit()
+        product_id = product.id
+    catalog.invalidate()
+    with SessionLocal() as db:
+        # Silinmiş bir ürünün id'si yeniden kullanılmış olabilir: önceki satışlar
+        before = summary_rows(db, SalesDailyProduct, "product_id").get(product_id)
+        subtotal_before = before.subtotal if before is not None else 0.0
+
+    items = [dict(product_id=product_id, quantity=1), dict(product_id=product_id, quantity=3, discount_rate=12.5)]
+    response = client.post("/invoices/create", json=dict(customer_id=1, items=items))
+    assert response.status_code == 200
+
+    with SessionLocal() as db:
+        incremental = product_totals(summary_rows(db, SalesDailyProduct, "product_id")[product_id])
+        customers = customer_totals(db)
+
+        rebuild_sales_summary(db, date.today(), date.today())
+        db.commit()
+
+        rebuilt = product_totals(summary_rows(db, SalesDailyProduct, "product_id")[product_id])
+        assert rebuilt == incremental
+        assert round(incremental["subtotal"] - subtotal_before, 2) == 4.03     # 1,01 + 3,02 (3 × 1,005 → 3,015)
+        assert customer_totals(db) == customers